@@ -4,7 +4,6 @@ from pathlib import Path
 
 from sqlalchemy import engine_from_config, pool
 from alembic import context
-import os
 
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -12,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 # Import application metadata and settings
 from app.models import Base
 from app.config import settings
+from app.migration_url import get_migration_url
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -35,32 +35,7 @@ target_metadata = Base.metadata
 
 
 def get_url() -> str:
-    # Load environment variables from local.env
-    from dotenv import load_dotenv
-    load_dotenv(Path(__file__).parent.parent / 'local.env')
-    
-    # First try to get from environment variables
-    db_url = os.getenv("DB_URL") or os.getenv("DATABASE_URL")
-    
-    # If not in environment, try to construct from individual settings
-    if not db_url:
-        db_host = os.getenv("DATABASE_HOST", "localhost")
-        db_port = os.getenv("DATABASE_PORT", "4000")
-        db_user = os.getenv("DATABASE_USER", "root")
-        db_password = os.getenv("DATABASE_PASSWORD", "")
-        db_name = os.getenv("DATABASE_NAME", "healthcare_study")
-        
-            # Construct the URL
-        db_url = f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?charset=utf8mb4"
-        
-        # Add SSL parameters if not in development
-        if os.getenv("ENVIRONMENT") != "development":
-            db_url += "&ssl_verify_cert=true&ssl_verify_identity=true"
-    
-    # Ensure the URL is in the correct format for SQLAlchemy
-    if db_url and db_url.startswith("mysql:"):
-        db_url = db_url.replace("mysql:", "mysql+pymysql:", 1)
-    
+    db_url = get_migration_url()
     print(f"Using database URL: {db_url}")
     return db_url
 
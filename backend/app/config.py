@@ -4,6 +4,7 @@ from typing import List, Optional, Dict, Any, Literal
 import os
 import logging
 import sys
+import functools
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -120,6 +121,12 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     structured_logging: bool = True
     
+    @field_validator('log_level', mode='before')
+    @classmethod
+    def normalize_log_level(cls, value: Any) -> Any:
+        """Upper-case the log level once so callers can compare it directly."""
+        return value.strip().upper() if isinstance(value, str) else value
+    
     # Performance configuration
     db_pool_size: int = 20
     db_max_overflow: int = 30
@@ -245,7 +252,7 @@ class Settings(BaseSettings):
         
         # Validate logging configuration
         valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.log_level.upper() not in valid_log_levels:
+        if self.log_level not in valid_log_levels:
             errors.append(f"Invalid LOG_LEVEL: {self.log_level}. Must be one of: {valid_log_levels}")
         
         if self.environment == "production" and self.log_level == "DEBUG":
@@ -302,14 +309,44 @@ class Settings(BaseSettings):
     def get_log_config(self) -> Dict[str, Any]:
         """Get logging configuration dictionary."""
         return {
-            "level": self.log_level.upper(),
+            "level": self.log_level,
             "structured": self.structured_logging,
             "format": "json" if self.structured_logging else "text"
         }
 
 
+def _settings_cache_key(env_files: List[str]) -> tuple:
+    """Key settings on the env files' mtimes and the process environment."""
+    mtimes: List[Optional[int]] = []
+    for env_file in env_files:
+        try:
+            mtimes.append(os.stat(env_file).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes), frozenset(os.environ.items())
+
+
+@functools.lru_cache(maxsize=4)
+def _load_settings(env_files: tuple, cache_key: tuple) -> Settings:
+    """Build and validate settings for `env_files` (cached per cache_key)."""
+    # Create settings with dynamic env_file list
+    class DynamicSettings(Settings):
+        model_config = SettingsConfigDict(
+            env_file=list(env_files),
+            env_file_encoding='utf-8',
+            extra='ignore',
+            case_sensitive=False
+        )
+    
+    return DynamicSettings()
+
+
 def get_settings() -> Settings:
-    """Get validated settings instance with environment-aware loading."""
+    """Get validated settings instance with environment-aware loading.
+    
+    The parsed settings are reused until an env file changes on disk or the
+    process environment changes.
+    """
     try:
         # Determine which environment files to load based on ENVIRONMENT variable
         env = os.getenv("ENVIRONMENT", "development").lower()
@@ -326,16 +363,7 @@ def get_settings() -> Settings:
             # Default to development
             env_files.append('.env.development')
         
-        # Create settings with dynamic env_file list
-        class DynamicSettings(Settings):
-            model_config = SettingsConfigDict(
-                env_file=env_files,
-                env_file_encoding='utf-8',
-                extra='ignore',
-                case_sensitive=False
-            )
-        
-        return DynamicSettings()
+        return _load_settings(tuple(env_files), _settings_cache_key(env_files))
     except Exception as e:
         logger.error(f"Failed to load configuration: {e}")
         if os.getenv("ENVIRONMENT") == "production":
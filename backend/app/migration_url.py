@@ -0,0 +1,39 @@
+"""Database URL used for Alembic migrations.
+
+alembic/env.py and the migration scripts both resolve the URL here, so a
+revision check and the migration that follows always target the same
+database.
+"""
+import os
+from pathlib import Path
+
+
+def get_migration_url() -> str:
+    """Resolve the migration database URL from the environment and local.env."""
+    # Load environment variables from local.env
+    from dotenv import load_dotenv
+    load_dotenv(Path(__file__).parent.parent / 'local.env')
+    
+    # First try to get from environment variables
+    db_url = os.getenv("DB_URL") or os.getenv("DATABASE_URL")
+    
+    # If not in environment, try to construct from individual settings
+    if not db_url:
+        db_host = os.getenv("DATABASE_HOST", "localhost")
+        db_port = os.getenv("DATABASE_PORT", "4000")
+        db_user = os.getenv("DATABASE_USER", "root")
+        db_password = os.getenv("DATABASE_PASSWORD", "")
+        db_name = os.getenv("DATABASE_NAME", "healthcare_study")
+        
+        # Construct the URL
+        db_url = f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?charset=utf8mb4"
+        
+        # Add SSL parameters if not in development
+        if os.getenv("ENVIRONMENT") != "development":
+            db_url += "&ssl_verify_cert=true&ssl_verify_identity=true"
+    
+    # Ensure the URL is in the correct format for SQLAlchemy
+    if db_url and db_url.startswith("mysql:"):
+        db_url = db_url.replace("mysql:", "mysql+pymysql:", 1)
+    
+    return db_url
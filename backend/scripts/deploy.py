@@ -9,6 +9,7 @@ This script orchestrates the entire deployment process including:
 - Rollback procedures if needed
 """
 
+import collections
 import os
 import sys
 import subprocess
@@ -21,21 +22,28 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
+# The deployment log keeps the last DEPLOYMENT_LOG_KEEP events; it is trimmed
+# only once it grows past DEPLOYMENT_LOG_MAX_BYTES so most events stay appends
+DEPLOYMENT_LOG_KEEP = 100
+DEPLOYMENT_LOG_MAX_BYTES = 256 * 1024
+
+def _trim_deployment_log(log_file):
+    """Rewrite the log with only its last DEPLOYMENT_LOG_KEEP lines."""
+    with open(log_file) as f:
+        tail = collections.deque(f, maxlen=DEPLOYMENT_LOG_KEEP)
+    tmp_file = log_file.with_suffix(".jsonl.tmp")
+    with open(tmp_file, 'w') as f:
+        f.writelines(tail)
+    os.replace(tmp_file, log_file)
+
 def log_deployment_event(event_type, message, success=True, details=None):
     """Log deployment events for monitoring and debugging."""
     log_dir = backend_dir / "logs"
     log_dir.mkdir(exist_ok=True)
     
-    log_file = log_dir / "deployment_log.json"
-    
-    # Load existing log or create new
-    log_entries = []
-    if log_file.exists():
-        try:
-            with open(log_file, 'r') as f:
-                log_entries = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            log_entries = []
+    # One JSON object per line, so each event is a single append instead of
+    # rewriting the whole log
+    log_file = log_dir / "deployment_log.jsonl"
     
     # Add new entry
     log_entry = {
@@ -49,14 +57,11 @@ def log_deployment_event(event_type, message, success=True, details=None):
         "details": details or {}
     }
     
-    log_entries.append(log_entry)
-    
-    # Keep only last 100 entries
-    log_entries = log_entries[-100:]
+    with open(log_file, 'a') as f:
+        f.write(json.dumps(log_entry) + "\n")
     
-    # Save updated log
-    with open(log_file, 'w') as f:
-        json.dump(log_entries, f, indent=2)
+    if log_file.stat().st_size > DEPLOYMENT_LOG_MAX_BYTES:
+        _trim_deployment_log(log_file)
     
     # Also print to stdout for deployment logs
     status = "✅" if success else "❌"
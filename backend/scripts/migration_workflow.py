@@ -141,7 +141,7 @@ def rollback_migrations():
         print("⚠️  This will attempt to rollback to the last known good state")
         confirm = input("Are you sure? Type 'yes' to confirm: ").strip()
         if confirm.lower() == "yes":
-            return run_script("rollback_migrations.py", ["emergency"])
+            return run_script("rollback_migrations.py", ["emergency", "--yes"])
         else:
             print("Emergency rollback cancelled")
             return False
@@ -7,21 +7,56 @@ comprehensive logging and verification.
 """
 
 import os
+import re
 import sys
+import argparse
+import atexit
+import shlex
+import shutil
 import subprocess
+import collections
 import json
 import datetime
 import time
+import signal
+import contextlib
+import functools
 from pathlib import Path
 
 # Add the backend directory to the Python path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
+
+# Alembic CLI output parsers. Revision ids in this repo are not all hex
+# (e.g. "2025_08_22_1330"), so match any identifier. `alembic current`
+# prints "<rev>" or "<rev> (head)" on a line of its own, after log lines and
+# env.py's "Using database URL: ..."; `alembic history` prints
+# "<down(s)> -> <rev> ...".
+_CURRENT_REV_RE = re.compile(r'^(\w+)(?:\s+\([^)]*\))*\s*$')
+_HISTORY_REV_RE = re.compile(r'->\s*(\w+)')
+
+# Number of trailing deployment log lines scanned for the last good revision
+DEPLOYMENT_LOG_TAIL = 200
+
+# Pre-rollback backup record; values are substituted as JSON literals
+BACKUP_INFO_TEMPLATE = (
+    '{{"timestamp": {timestamp}, "revision": {revision}, '
+    '"backup_type": "pre_rollback", "environment": {environment}}}\n'
+)
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create `path` (once per process) and return it as a Path."""
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
 def log_rollback_event(event_type, message, success=True, details=None):
     """Log rollback events for monitoring and debugging."""
-    log_dir = backend_dir / "logs"
-    log_dir.mkdir(exist_ok=True)
+    now_iso = datetime.datetime.now().isoformat()
+    
+    log_dir = _ensure_dir(str(backend_dir / "logs"))
     
     log_file = log_dir / "rollback_log.json"
     
@@ -36,7 +71,7 @@ def log_rollback_event(event_type, message, success=True, details=None):
     
     # Add new entry
     log_entry = {
-        "timestamp": datetime.datetime.now().isoformat(),
+        "timestamp": now_iso,
         "event_type": event_type,
         "message": message,
         "success": success,
@@ -55,19 +90,21 @@ def log_rollback_event(event_type, message, success=True, details=None):
     
     # Also print to stdout
     status = "✅" if success else "❌"
-    print(f"{status} [{datetime.datetime.now().isoformat()}] {event_type}: {message}")
+    print(f"{status} [{now_iso}] {event_type}: {message}")
 
 def run_command_with_timeout(command, timeout=300, cwd=None):
-    """Run a command with timeout and proper error handling."""
+    """Run a command (argv list or string) with timeout and proper error handling."""
     if cwd is None:
         cwd = backend_dir
     
-    print(f"Running: {command}")
+    if isinstance(command, str):
+        command = shlex.split(command)
+    
+    print(f"Running: {' '.join(command)}")
     
     try:
         result = subprocess.run(
             command,
-            shell=True,
             cwd=cwd,
             text=True,
             capture_output=True,
@@ -88,87 +125,233 @@ def run_command_with_timeout(command, timeout=300, cwd=None):
         print(f"❌ Command failed with exception: {e}")
         return False, "", str(e)
 
-def get_current_revision():
-    """Get current database revision."""
-    success, stdout, stderr = run_command_with_timeout("alembic current")
-    if success and stdout:
-        lines = stdout.strip().split('\n')
-        for line in lines:
-            if line.strip() and not line.startswith('INFO'):
-                revision = line.split()[0] if line.split() else None
-                return revision
+@functools.lru_cache(maxsize=1)
+def _alembic_bin():
+    """Resolve the alembic executable once; only needed for the CLI fallback."""
+    return shutil.which("alembic") or "alembic"
+
+@functools.lru_cache(maxsize=1)
+def _get_engine():
+    """Create an engine for the migration database on first use.
+    
+    Uses the same URL as alembic/env.py, so revision checks and verification
+    see the database that `alembic downgrade` changes. Created lazily to keep
+    SQLAlchemy out of invocations that never touch the database (e.g. --help).
+    """
+    from sqlalchemy import create_engine, pool
+    from app.migration_url import get_migration_url
+    return create_engine(get_migration_url(), poolclass=pool.NullPool)
+
+@contextlib.contextmanager
+def _time_limit(seconds):
+    """Raise TimeoutError if the block runs longer than `seconds` (Unix only)."""
+    if not hasattr(signal, "SIGALRM"):
+        yield
+        return
+    
+    def _on_alarm(signum, frame):
+        raise TimeoutError(f"Command timed out after {seconds} seconds")
+    
+    previous_handler = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+@functools.lru_cache(maxsize=1)
+def _alembic_config():
+    """Build the Alembic config once, anchored to the backend directory."""
+    from alembic.config import Config
+    
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "alembic"))
+    return config
+
+def _cli_current_revision():
+    """Get current database revision from the `alembic current` CLI."""
+    success, stdout, stderr = run_command_with_timeout([_alembic_bin(), "current"])
+    if not success:
+        raise RuntimeError(stderr or "alembic current failed")
+    for line in stdout.splitlines():
+        match = _CURRENT_REV_RE.match(line.strip())
+        if match:
+            return match.group(1)
     return None
 
+def _cli_migration_history():
+    """Get migration history from the `alembic history` CLI."""
+    success, stdout, stderr = run_command_with_timeout([_alembic_bin(), "history"])
+    if not success:
+        raise RuntimeError(stderr or "alembic history failed")
+    revisions = []
+    for line in stdout.splitlines():
+        if line.startswith('INFO'):
+            continue
+        match = _HISTORY_REV_RE.search(line)
+        if match:
+            revisions.append(match.group(1))
+    return revisions
+
+# The cached lookups raise on failure; lru_cache does not store exceptions,
+# so a transient database error is retried on the next call instead of
+# being remembered for the rest of the run.
+
+@functools.lru_cache(maxsize=1)
+def _current_revision():
+    """Read the current revision from the database; raises on failure."""
+    try:
+        from alembic.runtime.migration import MigrationContext
+    except ImportError:
+        return _cli_current_revision()
+    
+    with _get_engine().connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+@functools.lru_cache(maxsize=1)
+def _migration_history():
+    """List revisions newest first from the migration scripts; raises on failure."""
+    try:
+        from alembic.script import ScriptDirectory
+    except ImportError:
+        return _cli_migration_history()
+    
+    script = ScriptDirectory.from_config(_alembic_config())
+    return [rev.revision for rev in script.walk_revisions()]
+
+def get_current_revision():
+    """Get current database revision (cached until the next rollback)."""
+    try:
+        return _current_revision()
+    except Exception as e:
+        print(f"❌ Could not read current revision: {e}")
+        return None
+
 def get_migration_history():
-    """Get migration history to find valid rollback targets."""
-    success, stdout, stderr = run_command_with_timeout("alembic history")
-    if success and stdout:
-        revisions = []
-        lines = stdout.strip().split('\n')
-        for line in lines:
-            if line.strip() and not line.startswith('INFO') and '->' in line:
-                # Parse revision from history line
-                parts = line.split()
-                if parts:
-                    revision = parts[0]
-                    revisions.append(revision)
-        return revisions
-    return []
+    """Get migration history to find valid rollback targets (cached until the next rollback)."""
+    try:
+        return _migration_history()
+    except Exception as e:
+        print(f"❌ Could not read migration history: {e}")
+        return []
+
+def _downgrade(target_revision, timeout=600):
+    """Downgrade to `target_revision` in-process, falling back to the alembic CLI."""
+    try:
+        from alembic import command
+    except ImportError:
+        success, stdout, stderr = run_command_with_timeout(
+            [_alembic_bin(), "downgrade", target_revision], timeout=timeout
+        )
+        return success, stderr
+    
+    print(f"Running: alembic downgrade {target_revision} (in-process)")
+    
+    try:
+        with _time_limit(timeout):
+            command.downgrade(_alembic_config(), target_revision)
+        return True, ""
+    except TimeoutError as e:
+        print(f"❌ {e}")
+        return False, str(e)
+    except KeyboardInterrupt:
+        raise
+    except BaseException as e:
+        # env.py imports app.config, whose settings check calls sys.exit() on
+        # invalid production settings; report that as a failed downgrade too
+        error = repr(e) if isinstance(e, SystemExit) else str(e)
+        print(f"❌ Command failed with exception: {error}")
+        return False, error
+
+def _invalidate_revision_cache():
+    """Drop cached Alembic results so the next lookup reflects the database."""
+    _current_revision.cache_clear()
+    _migration_history.cache_clear()
+
+def _good_deployment_from_revision(entry):
+    """Return the "from" revision of a successful deployment entry, if any."""
+    if (entry.get("event_type") == "deployment_complete" and 
+        entry.get("success") and 
+        "details" in entry):
+        
+        # Try to extract the "from" revision from the message
+        message = entry.get("message", "")
+        if " -> " in message:
+            parts = message.split(" -> ")
+            if len(parts) >= 2:
+                return parts[0].split()[-1]  # Get last word before ->
+    return None
 
 def find_last_known_good_revision():
     """Find the last known good revision from deployment logs."""
-    log_file = backend_dir / "logs" / "deployment_log.json"
+    log_dir = backend_dir / "logs"
+    jsonl_file = log_dir / "deployment_log.jsonl"
+    legacy_file = log_dir / "deployment_log.json"
     
-    if not log_file.exists():
+    if not jsonl_file.exists() and not legacy_file.exists():
         print("⚠️  No deployment log found - cannot determine last known good revision")
         return None
     
-    try:
-        with open(log_file, 'r') as f:
-            log_entries = json.load(f)
-        
-        # Find the last successful deployment
-        for entry in reversed(log_entries):
-            if (entry.get("event_type") == "deployment_complete" and 
-                entry.get("success") and 
-                "details" in entry):
-                
-                # Try to extract the "from" revision from the message
-                message = entry.get("message", "")
-                if " -> " in message:
-                    parts = message.split(" -> ")
-                    if len(parts) >= 2:
-                        from_revision = parts[0].split()[-1]  # Get last word before ->
-                        return from_revision
-        
-        print("⚠️  No successful deployment found in logs")
-        return None
+    # The deploy scripts append one JSON object per line; only the tail
+    # has to be parsed
+    if jsonl_file.exists():
+        try:
+            with open(jsonl_file, 'r') as f:
+                tail = collections.deque(f, maxlen=DEPLOYMENT_LOG_TAIL)
+            
+            for line in reversed(tail):
+                if not line.strip():
+                    continue
+                try:
+                    from_revision = _good_deployment_from_revision(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+                if from_revision:
+                    return from_revision
+        except FileNotFoundError:
+            pass
+    
+    # Logs written before the switch to JSON Lines are a single JSON array
+    if legacy_file.exists():
+        try:
+            with open(legacy_file, 'r') as f:
+                log_entries = json.load(f)
+            
+            for entry in reversed(log_entries):
+                from_revision = _good_deployment_from_revision(entry)
+                if from_revision:
+                    return from_revision
+        except (json.JSONDecodeError, FileNotFoundError):
+            print("⚠️  Could not read deployment log")
+            return None
     
-    except (json.JSONDecodeError, FileNotFoundError):
-        print("⚠️  Could not read deployment log")
-        return None
+    print("⚠️  No successful deployment found in logs")
+    return None
 
-def validate_rollback_target(target_revision):
+def validate_rollback_target(target_revision, assume_yes=False):
     """Validate that the target revision exists and is safe to rollback to."""
     print(f"🔍 Validating rollback target: {target_revision}")
     
-    # Get migration history
+    # Get migration history and index it once
     history = get_migration_history()
+    position = {rev: i for i, rev in enumerate(history)}
     
-    if target_revision not in history:
+    if target_revision not in position:
         log_rollback_event("validation_failed", f"Target revision {target_revision} not found in history", False)
         return False
     
     # Check if target is not too far back (safety check)
     current_rev = get_current_revision()
-    if current_rev in history and target_revision in history:
-        current_index = history.index(current_rev)
-        target_index = history.index(target_revision)
+    if current_rev in position:
+        current_index = position[current_rev]
+        target_index = position[target_revision]
         
-        steps_back = current_index - target_index
+        # History is listed newest first, so older targets have larger indexes
+        steps_back = target_index - current_index
         if steps_back > 10:  # More than 10 migrations back
             print(f"⚠️  Warning: Rolling back {steps_back} migrations")
-            response = input("This is a large rollback. Are you sure? (yes/no): ")
+            response = "yes" if assume_yes else input("This is a large rollback. Are you sure? (yes/no): ")
             if response.lower() != "yes":
                 log_rollback_event("validation_cancelled", "Large rollback cancelled by user", False)
                 return False
@@ -181,20 +364,22 @@ def create_pre_rollback_backup():
     print("💾 Creating pre-rollback backup...")
     
     current_rev = get_current_revision()
-    backup_info = {
-        "timestamp": datetime.datetime.now().isoformat(),
-        "revision": current_rev,
-        "backup_type": "pre_rollback",
-        "environment": os.getenv("ENVIRONMENT", "unknown")
-    }
+    now = datetime.datetime.now()
     
-    backup_dir = backend_dir / "backups"
-    backup_dir.mkdir(exist_ok=True)
+    # The backup record has a fixed shape, so fill a template rather than
+    # running the JSON encoder over a dict; only the values need escaping.
+    payload = BACKUP_INFO_TEMPLATE.format(
+        timestamp=json.dumps(now.isoformat()),
+        revision=json.dumps(current_rev),
+        environment=json.dumps(os.getenv("ENVIRONMENT", "unknown"))
+    )
     
-    backup_file = backup_dir / f"pre_rollback_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    backup_dir = _ensure_dir(str(backend_dir / "backups"))
     
-    with open(backup_file, 'w') as f:
-        json.dump(backup_info, f, indent=2)
+    backup_file = backup_dir / f"pre_rollback_{now.strftime('%Y%m%d_%H%M%S')}.json"
+    
+    with open(backup_file, 'wb') as f:
+        f.write(payload.encode("utf-8"))
     
     log_rollback_event("backup_created", f"Pre-rollback backup created: {backup_file}", True)
     print(f"✅ Backup info saved to: {backup_file}")
@@ -207,7 +392,10 @@ def perform_rollback(target_revision):
     current_rev = get_current_revision()
     start_time = time.time()
     
-    success, stdout, stderr = run_command_with_timeout(f"alembic downgrade {target_revision}", timeout=600)
+    success, stderr = _downgrade(target_revision, timeout=600)
+    
+    # The downgrade may have moved the database even if it reported failure
+    _invalidate_revision_cache()
     
     end_time = time.time()
     duration = end_time - start_time
@@ -232,6 +420,22 @@ def perform_rollback(target_revision):
         print(f"Error: {stderr}")
         return False
 
+# Connection reused by every verification in this process (see _verify_connection)
+_VERIFY_CONN = None
+
+def _verify_connection():
+    """Return the shared connection used for post-rollback health checks.
+    
+    The connection is opened on first use and closed at interpreter exit, so
+    repeated verifications (normal + emergency paths) pay the TiDB TLS/auth
+    handshake once.
+    """
+    global _VERIFY_CONN
+    if _VERIFY_CONN is None or _VERIFY_CONN.closed:
+        _VERIFY_CONN = _get_engine().connect()
+        atexit.register(_VERIFY_CONN.close)
+    return _VERIFY_CONN
+
 def verify_rollback_success(target_revision):
     """Verify that rollback was successful."""
     print("🔍 Verifying rollback success...")
@@ -244,12 +448,14 @@ def verify_rollback_success(target_revision):
             return False
         
         # Check database connectivity
-        from app.database import engine
         from sqlalchemy import text
         
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            result.fetchone()
+        conn = _verify_connection()
+        try:
+            conn.execute(text("SELECT 1")).fetchone()
+        finally:
+            # End the implicit transaction so the next check sees fresh state
+            conn.rollback()
         
         log_rollback_event("verification_success", f"Rollback verification successful - at revision {current_rev}", True)
         print(f"✅ Rollback verification successful - at revision {current_rev}")
@@ -260,13 +466,14 @@ def verify_rollback_success(target_revision):
         print(f"❌ Rollback verification failed: {e}")
         return False
 
-def emergency_rollback():
-    """Perform emergency rollback to last known good state."""
+def emergency_rollback(target_revision=None, assume_yes=False):
+    """Perform emergency rollback to last known good state (or `target_revision`)."""
     print("🚨 EMERGENCY ROLLBACK PROCEDURE")
     print("=" * 50)
     
-    # Find last known good revision
-    target_revision = find_last_known_good_revision()
+    # Find last known good revision unless one was given explicitly
+    if not target_revision:
+        target_revision = find_last_known_good_revision()
     
     if not target_revision:
         print("❌ Cannot determine last known good revision")
@@ -276,7 +483,7 @@ def emergency_rollback():
     print(f"🎯 Target revision: {target_revision}")
     
     # Confirm emergency rollback
-    response = input("This is an EMERGENCY ROLLBACK. Continue? (yes/no): ")
+    response = "yes" if assume_yes else input("This is an EMERGENCY ROLLBACK. Continue? (yes/no): ")
     if response.lower() != "yes":
         print("Emergency rollback cancelled")
         return False
@@ -298,22 +505,100 @@ def emergency_rollback():
     print("❌ Emergency rollback failed!")
     return False
 
+def _do_rollback(args):
+    """Validate, back up, roll back to and verify `args.revision`."""
+    target_revision = args.revision
+    
+    log_rollback_event("rollback_start", f"Starting rollback to {target_revision}")
+    
+    # Validate target
+    if not validate_rollback_target(target_revision, assume_yes=args.yes):
+        return
+    
+    # Create backup
+    create_pre_rollback_backup()
+    
+    # Perform rollback
+    if perform_rollback(target_revision):
+        if verify_rollback_success(target_revision):
+            print("🎉 Rollback completed successfully!")
+        else:
+            print("❌ Rollback verification failed!")
+    else:
+        print("❌ Rollback failed!")
+
+def _do_emergency(args):
+    """Run the emergency rollback procedure."""
+    emergency_rollback(target_revision=args.target, assume_yes=args.yes)
+
+def _do_status(args):
+    """Show current, last known good and available revisions."""
+    current_rev = get_current_revision()
+    print(f"Current revision: {current_rev}")
+    
+    last_good = find_last_known_good_revision()
+    print(f"Last known good: {last_good}")
+    
+    history = get_migration_history()
+    print(f"Available revisions: {len(history)}")
+
+# Subcommand name -> handler taking the parsed arguments
+COMMANDS = {
+    "rollback": _do_rollback,
+    "emergency": _do_emergency,
+    "status": _do_status,
+}
+
+def build_parser():
+    """Build the command-line parser for the rollback script."""
+    parser = argparse.ArgumentParser(
+        description="Migration Rollback Script",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python rollback_migrations.py rollback abc123
+  python rollback_migrations.py rollback abc123 --yes
+  python rollback_migrations.py emergency --yes
+  python rollback_migrations.py status
+        """
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    
+    rollback_parser = subparsers.add_parser("rollback", help="Rollback to specific revision")
+    rollback_parser.add_argument("revision", help="Target revision")
+    rollback_parser.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="Skip confirmation prompts (for automation)"
+    )
+    
+    emergency_parser = subparsers.add_parser(
+        "emergency", help="Emergency rollback to last known good state"
+    )
+    emergency_parser.add_argument(
+        "--target",
+        help="Revision to roll back to instead of the last known good one"
+    )
+    emergency_parser.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="Skip confirmation prompts (for automation)"
+    )
+    
+    subparsers.add_parser("status", help="Show current rollback status")
+    
+    return parser
+
 def main():
     """Main rollback function."""
-    if len(sys.argv) < 2:
-        print("Migration Rollback Script")
-        print("=" * 30)
-        print("Usage: python rollback_migrations.py <command> [revision]")
-        print("\nCommands:")
-        print("  rollback <revision>  - Rollback to specific revision")
-        print("  emergency           - Emergency rollback to last known good state")
-        print("  status              - Show current rollback status")
-        print("\nExamples:")
-        print("  python rollback_migrations.py rollback abc123")
-        print("  python rollback_migrations.py emergency")
+    parser = build_parser()
+    args = parser.parse_args()
+    
+    if args.command is None:
+        parser.print_help()
         return
     
-    command = sys.argv[1].lower()
+    command = args.command
     
     print("🔄 Healthcare Study Companion - Migration Rollback Script")
     print("=" * 60)
@@ -324,44 +609,9 @@ def main():
     print("=" * 60)
     
     try:
-        if command == "rollback":
-            if len(sys.argv) < 3:
-                print("❌ Error: Target revision required")
-                return
-            
-            target_revision = sys.argv[2]
-            
-            log_rollback_event("rollback_start", f"Starting rollback to {target_revision}")
-            
-            # Validate target
-            if not validate_rollback_target(target_revision):
-                return
-            
-            # Create backup
-            create_pre_rollback_backup()
-            
-            # Perform rollback
-            if perform_rollback(target_revision):
-                if verify_rollback_success(target_revision):
-                    print("🎉 Rollback completed successfully!")
-                else:
-                    print("❌ Rollback verification failed!")
-            else:
-                print("❌ Rollback failed!")
-        
-        elif command == "emergency":
-            emergency_rollback()
-        
-        elif command == "status":
-            current_rev = get_current_revision()
-            print(f"Current revision: {current_rev}")
-            
-            last_good = find_last_known_good_revision()
-            print(f"Last known good: {last_good}")
-            
-            history = get_migration_history()
-            print(f"Available revisions: {len(history)}")
-        
+        handler = COMMANDS.get(command)
+        if handler:
+            handler(args)
         else:
             print(f"Unknown command: {command}")
     
@@ -1,39 +1,52 @@
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
+import functools
+import itertools
 import random
 
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import SessionLocal
 from app.models import User, UserRole, Topic, Document, DocumentStatus, QAHistory, Flashcard, FlashcardReview
 from app.auth import get_password_hash
 
+@functools.lru_cache(maxsize=32)
+def _hash(password: str) -> str:
+    """Hash a seed password once; bcrypt is the slowest step of seeding."""
+    return get_password_hash(password)
+
 def create_test_data():
     """Create test data for the database."""
-    db: Session = next(get_db())
+    # Use the session factory directly; get_db() is a FastAPI dependency
+    db: Session = SessionLocal()
     
     try:
+        rng = random.Random(42)  # Reproducible seed data
+        now = datetime.utcnow()
+        
+        admin_hash = _hash("admin123")
+        user_hash = _hash("user123")
+        
         # Create test users
         admin_user = User(
             email="admin@example.com",
-            password_hash=get_password_hash("admin123"),
+            password_hash=admin_hash,
             full_name="Admin User",
             role=UserRole.ADMIN,
             is_active=True
         )
-        db.add(admin_user)
         
         test_user = User(
             email="user@example.com",
-            password_hash=get_password_hash("user123"),
+            password_hash=user_hash,
             full_name="Test User",
             role=UserRole.USER,
             is_active=True
         )
-        db.add(test_user)
+        db.add_all([admin_user, test_user])
         db.flush()  # Flush to get user IDs
         
         # Create topics
@@ -45,20 +58,19 @@ def create_test_data():
             ("Emergency Procedures", "Basic emergency medical procedures and protocols")
         ]
         
-        topics = []
-        for i, (title, description) in enumerate(medical_topics):
-            topic = Topic(
+        topics = [
+            Topic(
                 owner_id=admin_user.id if i % 2 == 0 else test_user.id,
                 title=title,
                 description=description,
                 is_public=(i % 3 != 0)  # Make some topics public
             )
-            topics.append(topic)
-            db.add(topic)
-        
+            for i, (title, description) in enumerate(medical_topics)
+        ]
+        db.add_all(topics)
         db.flush()  # Flush to get topic IDs
         
-        # Create documents for each topic
+        # Create documents for each topic (bulk insert, no IDs needed back)
         document_titles = [
             "Introduction to {}",
             "Advanced Concepts in {}",
@@ -67,21 +79,27 @@ def create_test_data():
             "Research Papers on {}"
         ]
         
-        for topic in topics:
-            for i, title_template in enumerate(document_titles[:3]):  # 3 docs per topic
-                doc = Document(
-                    topic_id=topic.id,
-                    filename=f"{topic.title.lower().replace(' ', '_')}_{i+1}.pdf",
-                    content_type="application/pdf",
-                    file_size=random.randint(100000, 5000000),  # 100KB to 5MB
-                    status=DocumentStatus.PROCESSED if i % 2 == 0 else DocumentStatus.UPLOADED,
-                    text=f"This is sample extracted text for {title_template.format(topic.title)}. "
-                         f"It contains important information about {topic.title}.",
-                    file_metadata={"pages": random.randint(5, 50), "source": "test_data"},
-                    vector_dim=768 if i % 2 == 0 else None,
-                    processed_at=datetime.utcnow() if i % 2 == 0 else None
-                )
-                db.add(doc)
+        # Draw each random column up front, then zip it into the rows
+        doc_slots = list(itertools.product(topics, enumerate(document_titles[:3])))  # 3 docs per topic
+        file_sizes = [rng.randint(100000, 5000000) for _ in doc_slots]  # 100KB to 5MB
+        page_counts = [rng.randint(5, 50) for _ in doc_slots]
+        
+        documents = [
+            dict(
+                topic_id=topic.id,
+                filename=f"{topic.title.lower().replace(' ', '_')}_{i+1}.pdf",
+                content_type="application/pdf",
+                file_size=file_size,
+                status=DocumentStatus.PROCESSED if i % 2 == 0 else DocumentStatus.UPLOADED,
+                text=f"This is sample extracted text for {title_template.format(topic.title)}. "
+                     f"It contains important information about {topic.title}.",
+                file_metadata={"pages": pages, "source": "test_data"},
+                vector_dim=768 if i % 2 == 0 else None,
+                processed_at=now if i % 2 == 0 else None
+            )
+            for (topic, (i, title_template)), file_size, pages in zip(doc_slots, file_sizes, page_counts)
+        ]
+        db.bulk_insert_mappings(Document, documents)
         
         # Create flashcards
         flashcard_data = [
@@ -92,18 +110,28 @@ def create_test_data():
             ("What is the largest organ in the human body?", "Skin")
         ]
         
-        for i, (front, back) in enumerate(flashcard_data):
-            flashcard = Flashcard(
+        n_cards = len(flashcard_data)
+        days_since_review = [rng.randint(1, 30) for _ in range(n_cards)]
+        days_until_review = [rng.randint(1, 30) for _ in range(n_cards)]
+        ease_factors = [round(rng.uniform(1.5, 2.5), 2) for _ in range(n_cards)]
+        review_counts = [rng.randint(0, 10) for _ in range(n_cards)]
+        
+        flashcards = [
+            dict(
                 topic_id=topics[i % len(topics)].id,
                 front=front,
                 back=back,
                 is_active=True,
-                last_reviewed=datetime.utcnow() - timedelta(days=random.randint(1, 30)),
-                next_review=datetime.utcnow() + timedelta(days=random.randint(1, 30)),
-                ease_factor=round(random.uniform(1.5, 2.5), 2),
-                review_count=random.randint(0, 10)
+                last_reviewed=now - timedelta(days=since),
+                next_review=now + timedelta(days=until),
+                ease_factor=ease_factor,
+                review_count=review_count
+            )
+            for i, ((front, back), since, until, ease_factor, review_count) in enumerate(
+                zip(flashcard_data, days_since_review, days_until_review, ease_factors, review_counts)
             )
-            db.add(flashcard)
+        ]
+        db.bulk_insert_mappings(Flashcard, flashcards)
         
         # Create QA history
         qa_pairs = [
@@ -117,16 +145,20 @@ def create_test_data():
              "PRN stands for 'pro re nata', which means 'as needed' in Latin.")
         ]
         
-        for i, (question, answer) in enumerate(qa_pairs):
-            qa = QAHistory(
+        scores = [round(rng.uniform(3.0, 5.0), 1) for _ in qa_pairs]
+        
+        qa_history = [
+            dict(
                 topic_id=topics[i % len(topics)].id,
                 user_id=admin_user.id if i % 2 == 0 else test_user.id,
                 question=question,
                 answer=answer,
-                score=round(random.uniform(3.0, 5.0), 1),
+                score=score,
                 feedback="Helpful response" if i % 2 == 0 else "Needs more detail"
             )
-            db.add(qa)
+            for i, ((question, answer), score) in enumerate(zip(qa_pairs, scores))
+        ]
+        db.bulk_insert_mappings(QAHistory, qa_history)
         
         db.commit()
         print("✅ Successfully created test data!")
@@ -12,14 +12,15 @@ import os
 import sys
 import argparse
 import secrets
-import string
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 def generate_jwt_secret(length: int = 64) -> str:
-    """Generate a secure JWT secret."""
-    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    """Generate a secure URL-safe JWT secret."""
+    # token_urlsafe yields 4 characters per 3 random bytes; round up so the
+    # result is never shorter than requested.
+    nbytes = -(-length * 3 // 4)
+    return secrets.token_urlsafe(nbytes)[:length]
 
 def get_user_input(prompt: str, default: str = "", required: bool = False, secret: bool = False) -> str:
     """Get user input with validation."""
@@ -168,16 +169,13 @@ def write_env_file(config: Dict[str, str], filename: str) -> None:
         filepath.rename(backup_path)
         print(f"📁 Backed up existing {filename} to {backup_path}")
     
-    # Write new configuration
-    with open(filepath, 'w') as f:
-        f.write(f"# Healthcare Study Companion Environment Configuration\n")
-        f.write(f"# Generated by setup script\n\n")
-        
-        for key, value in config.items():
-            if key.startswith("#"):
-                f.write(f"{key}={value}\n")
-            else:
-                f.write(f"{key}={value}\n")
+    # Write new configuration in a single call
+    header = (
+        "# Healthcare Study Companion Environment Configuration\n"
+        "# Generated by setup script\n\n"
+    )
+    body = "".join(f"{key}={value}\n" for key, value in config.items())
+    filepath.write_text(header + body, encoding="utf-8")
     
     print(f"✅ Configuration written to {filename}")
 
@@ -6,69 +6,77 @@ This script ensures all migration scripts are properly configured and executable
 """
 
 import os
+import sys
 import stat
-from pathlib import Path
 
-def make_executable(file_path):
-    """Make a file executable on Unix-like systems."""
+# Migration scripts to make executable
+MIGRATION_SCRIPTS = (
+    "manage_migrations.py",
+    "deploy_migrations.py",
+    "rollback_migrations.py",
+    "generate_migration.py",
+    "migration_workflow.py",
+    "deploy.py"
+)
+
+_DIRECT_SCRIPT_ACCESS = "\n".join(f"  python scripts/{script}" for script in MIGRATION_SCRIPTS)
+
+# Closing help text, built once at import and written in one call
+SETUP_COMPLETE_BANNER = f"""
+📋 Migration Workflow Setup Complete!
+
+Available commands:
+  python scripts/migration_workflow.py help    - Show all available commands
+  python scripts/migration_workflow.py status  - Check migration status
+  python scripts/migration_workflow.py create  - Create new migration
+  python scripts/migration_workflow.py apply   - Apply migrations
+  python scripts/migration_workflow.py deploy  - Run deployment workflow
+
+Direct script access:
+{_DIRECT_SCRIPT_ACCESS}
+
+🎯 Quick Start:
+1. Check current status: python scripts/migration_workflow.py status
+2. Create a migration: python scripts/migration_workflow.py create
+3. Apply migrations: python scripts/migration_workflow.py apply
+"""
+
+def make_executable(entry):
+    """Make a scanned file (os.DirEntry) executable on Unix-like systems."""
     if os.name != 'nt':  # Not Windows
-        current_permissions = file_path.stat().st_mode
-        file_path.chmod(current_permissions | stat.S_IEXEC)
-        print(f"✅ Made executable: {file_path.name}")
+        current_permissions = entry.stat().st_mode
+        os.chmod(entry.path, current_permissions | stat.S_IEXEC)
+        print(f"✅ Made executable: {entry.name}")
     else:
-        print(f"ℹ️  Windows detected - {file_path.name} permissions unchanged")
+        print(f"ℹ️  Windows detected - {entry.name} permissions unchanged")
 
 def main():
     """Setup migration scripts."""
     print("🔧 Setting up migration workflow scripts...")
     print("=" * 50)
     
-    scripts_dir = Path(__file__).parent
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
     
-    # List of migration scripts to make executable
-    migration_scripts = [
-        "manage_migrations.py",
-        "deploy_migrations.py",
-        "rollback_migrations.py",
-        "generate_migration.py",
-        "migration_workflow.py",
-        "deploy.py"
-    ]
+    # One directory scan instead of an exists() + stat() per script
+    wanted = set(MIGRATION_SCRIPTS)
+    with os.scandir(scripts_dir) as entries:
+        found = {entry.name: entry for entry in entries if entry.name in wanted}
     
-    for script_name in migration_scripts:
-        script_path = scripts_dir / script_name
-        if script_path.exists():
-            make_executable(script_path)
+    for script_name in MIGRATION_SCRIPTS:
+        if script_name in found:
+            make_executable(found[script_name])
         else:
             print(f"⚠️  Script not found: {script_name}")
     
     # Create necessary directories
-    backend_dir = scripts_dir.parent
-    directories_to_create = [
-        backend_dir / "logs",
-        backend_dir / "backups"
-    ]
+    backend_dir = os.path.dirname(scripts_dir)
+    directories_to_create = ("logs", "backups")
     
     for directory in directories_to_create:
-        directory.mkdir(exist_ok=True)
-        print(f"📁 Created directory: {directory.name}")
-    
-    print("\n📋 Migration Workflow Setup Complete!")
-    print("\nAvailable commands:")
-    print("  python scripts/migration_workflow.py help    - Show all available commands")
-    print("  python scripts/migration_workflow.py status  - Check migration status")
-    print("  python scripts/migration_workflow.py create  - Create new migration")
-    print("  python scripts/migration_workflow.py apply   - Apply migrations")
-    print("  python scripts/migration_workflow.py deploy  - Run deployment workflow")
-    
-    print("\nDirect script access:")
-    for script in migration_scripts:
-        print(f"  python scripts/{script}")
+        os.makedirs(os.path.join(backend_dir, directory), exist_ok=True)
+    print(f"📁 Created directories: {', '.join(directories_to_create)}")
     
-    print("\n🎯 Quick Start:")
-    print("1. Check current status: python scripts/migration_workflow.py status")
-    print("2. Create a migration: python scripts/migration_workflow.py create")
-    print("3. Apply migrations: python scripts/migration_workflow.py apply")
+    sys.stdout.write(SETUP_COMPLETE_BANNER)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
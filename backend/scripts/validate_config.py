@@ -12,21 +12,30 @@ Options:
     --environment ENV    Validate for specific environment (development, staging, production)
     --strict            Fail on warnings (useful for CI/CD)
     --check-connections Test actual connections (database, APIs)
+    --json              Emit the report as JSON instead of text
+    --verbose           Print the full report even when validation passes cleanly
     --help              Show this help message
 """
 
+from __future__ import annotations
+
 import sys
 import os
+import json
 import argparse
+import functools
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 import asyncio
 
 # Add the app directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.config import Settings, ConfigurationError, get_settings
+# app.config is imported lazily in validate_settings so that --help and
+# argument errors don't pay for building the pydantic Settings model
+if TYPE_CHECKING:
+    from app.config import Settings
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +44,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Environment files checked by validate_environment_files, in report order
+ENV_FILES = (
+    'local.env',
+    '.env.development',
+    '.env.staging',
+    '.env.production',
+    '.env.example'
+)
+_ENV_FILE_NAMES = frozenset(ENV_FILES)
+
+REPORT_SEPARATOR = "=" * 60
+
 class ConfigValidator:
     """Comprehensive configuration validator."""
     
@@ -44,21 +65,20 @@ class ConfigValidator:
         self.errors: List[str] = []
         self.warnings: List[str] = []
         self.info: List[str] = []
+        self._settings: Optional[Settings] = None
     
     def validate_environment_files(self) -> None:
         """Validate that environment files exist and are readable."""
-        env_files = [
-            'local.env',
-            '.env.development',
-            '.env.staging', 
-            '.env.production',
-            '.env.example'
-        ]
+        # One directory scan; only files that are present get stat'ed
+        sizes: Dict[str, int] = {}
+        with os.scandir('.') as entries:
+            for entry in entries:
+                if entry.name in _ENV_FILE_NAMES and entry.is_file():
+                    sizes[entry.name] = entry.stat().st_size
         
-        for env_file in env_files:
-            file_path = Path(env_file)
-            if file_path.exists():
-                if file_path.stat().st_size == 0:
+        for env_file in ENV_FILES:
+            if env_file in sizes:
+                if sizes[env_file] == 0:
                     self.warnings.append(f"Environment file {env_file} is empty")
                 else:
                     self.info.append(f"Found environment file: {env_file}")
@@ -67,8 +87,13 @@ class ConfigValidator:
     
     def validate_settings(self) -> Optional[Settings]:
         """Validate settings configuration."""
+        from app.config import ConfigurationError, get_settings
+        
         try:
-            settings = get_settings()
+            # Load once per validator; connection tests reuse the same object
+            if self._settings is None:
+                self._settings = get_settings()
+            settings = self._settings
             self.info.append(f"Configuration loaded successfully for environment: {settings.environment}")
             
             # Environment-specific validations
@@ -97,7 +122,7 @@ class ConfigValidator:
         if not settings.structured_logging:
             self.warnings.append("Structured logging is disabled in production")
         
-        if settings.log_level.upper() == "DEBUG":
+        if settings.log_level == "DEBUG":
             self.warnings.append("Debug logging is enabled in production")
         
         # Performance validations
@@ -120,7 +145,7 @@ class ConfigValidator:
         if settings.jwt_secret == "change-me":
             self.info.append("Using default JWT secret in development (this is OK)")
         
-        if settings.log_level.upper() != "DEBUG":
+        if settings.log_level != "DEBUG":
             self.info.append("Consider using DEBUG log level in development")
     
     async def test_database_connection(self, settings: Settings) -> None:
@@ -129,12 +154,17 @@ class ConfigValidator:
             from app.database import engine
             from sqlalchemy import text
             
-            async with engine.begin() as conn:
-                result = await conn.execute(text("SELECT 1"))
-                if result.scalar() == 1:
-                    self.info.append("✅ Database connection successful")
-                else:
-                    self.errors.append("❌ Database connection test failed")
+            def _select_one() -> Any:
+                # SELECT 1 needs no transaction, so skip engine.begin()'s BEGIN/COMMIT
+                with engine.connect() as conn:
+                    return conn.execute(text("SELECT 1")).scalar()
+            
+            # app.database.engine is a pooled (pool_pre_ping) sync engine; run the
+            # blocking check in a worker thread so it overlaps with other phases
+            if await asyncio.to_thread(_select_one) == 1:
+                self.info.append("✅ Database connection successful")
+            else:
+                self.errors.append("❌ Database connection test failed")
                     
         except Exception as e:
             self.errors.append(f"❌ Database connection failed: {e}")
@@ -158,74 +188,136 @@ class ConfigValidator:
     
     def validate_file_permissions(self) -> None:
         """Validate file and directory permissions."""
+        # os.access succeeds for the common case (directory exists and is
+        # writable) in one syscall; only on failure do we stat to tell
+        # "missing" apart from "not writable".
+        
         # Check uploads directory
-        uploads_dir = Path("uploads")
-        if not uploads_dir.exists():
+        if os.access("uploads", os.W_OK):
+            self.info.append("✅ Uploads directory is writable")
+        elif not os.path.exists("uploads"):
             self.warnings.append("Uploads directory does not exist - will be created on first upload")
-        elif not os.access(uploads_dir, os.W_OK):
-            self.errors.append("Uploads directory is not writable")
         else:
-            self.info.append("✅ Uploads directory is writable")
+            self.errors.append("Uploads directory is not writable")
         
         # Check logs directory
-        logs_dir = Path("logs")
-        if not logs_dir.exists():
+        if os.access("logs", os.W_OK):
+            pass
+        elif not os.path.exists("logs"):
             self.info.append("Logs directory does not exist - will be created if needed")
-        elif not os.access(logs_dir, os.W_OK):
+        else:
             self.warnings.append("Logs directory is not writable")
     
+    def _phase(self) -> "ConfigValidator":
+        """Create a validator that collects a single phase's results."""
+        return ConfigValidator(environment=self.environment, strict=self.strict)
+    
+    def _merge(self, phase: "ConfigValidator") -> None:
+        """Append a phase's results to this validator."""
+        self.errors.extend(phase.errors)
+        self.warnings.extend(phase.warnings)
+        self.info.extend(phase.info)
+    
+    async def run_checks(self, check_connections: bool = False, show_progress: bool = True) -> Optional[Settings]:
+        """Run all validation phases, overlapping the independent I/O-bound ones.
+        
+        Each phase records into its own validator and the results are merged
+        in a fixed order, so the report does not depend on task scheduling.
+        """
+        env_phase, settings_phase, permissions_phase = self._phase(), self._phase(), self._phase()
+        
+        settings_phase._settings = self._settings
+        settings = settings_phase.validate_settings()
+        self._settings = settings_phase._settings
+        
+        phases = [env_phase, settings_phase, permissions_phase]
+        tasks = [
+            asyncio.to_thread(env_phase.validate_environment_files),
+            asyncio.to_thread(permissions_phase.validate_file_permissions),
+        ]
+        
+        # Test connections if requested
+        if check_connections and settings:
+            if show_progress:
+                print("🔗 Testing connections...")
+            db_phase, llm_phase = self._phase(), self._phase()
+            phases += [db_phase, llm_phase]
+            tasks += [
+                db_phase.test_database_connection(settings),
+                llm_phase.test_llm_api_connection(settings),
+            ]
+        
+        await asyncio.gather(*tasks)
+        
+        for phase in phases:
+            self._merge(phase)
+        
+        return settings
+    
     def generate_report(self) -> Dict[str, Any]:
         """Generate validation report."""
+        total_errors, total_warnings, total_info = len(self.errors), len(self.warnings), len(self.info)
         return {
-            "status": "failed" if self.errors else ("warning" if self.warnings else "passed"),
+            "status": "failed" if total_errors else ("warning" if total_warnings else "passed"),
             "errors": self.errors,
             "warnings": self.warnings,
             "info": self.info,
             "summary": {
-                "total_errors": len(self.errors),
-                "total_warnings": len(self.warnings),
-                "total_info": len(self.info)
+                "total_errors": total_errors,
+                "total_warnings": total_warnings,
+                "total_info": total_info
             }
         }
     
-    def print_report(self) -> None:
-        """Print formatted validation report."""
-        print("\n" + "="*60)
-        print("CONFIGURATION VALIDATION REPORT")
-        print("="*60)
+    def is_successful(self) -> bool:
+        """Whether validation passed (warnings fail only in strict mode)."""
+        return not self.errors and not (self.warnings and self.strict)
+    
+    def print_report(self, verbose: bool = False) -> bool:
+        """Print formatted validation report.
         
-        if self.errors:
-            print(f"\n❌ ERRORS ({len(self.errors)}):")
-            for error in self.errors:
-                print(f"   {error}")
+        A clean run (no errors or warnings) prints a single summary line unless
+        `verbose` is set; the full report is kept for diagnosing failures.
+        """
+        total_errors, total_warnings, total_info = len(self.errors), len(self.warnings), len(self.info)
         
-        if self.warnings:
-            print(f"\n⚠️  WARNINGS ({len(self.warnings)}):")
-            for warning in self.warnings:
-                print(f"   {warning}")
+        if not total_errors and not total_warnings and not verbose:
+            sys.stdout.write(f"✅ VALIDATION PASSED ({total_info} info messages, use --verbose to list)\n")
+            return True
         
-        if self.info:
-            print(f"\nℹ️  INFO ({len(self.info)}):")
-            for info in self.info:
-                print(f"   {info}")
+        # Build the whole report and emit it with a single write
+        parts = ["\n" + REPORT_SEPARATOR, "CONFIGURATION VALIDATION REPORT", REPORT_SEPARATOR]
         
-        print("\n" + "="*60)
+        if total_errors:
+            parts.append(f"\n❌ ERRORS ({total_errors}):")
+            parts.extend(f"   {error}" for error in self.errors)
         
-        if self.errors:
-            print("❌ VALIDATION FAILED - Please fix the errors above")
-            return False
-        elif self.warnings and self.strict:
-            print("⚠️  VALIDATION FAILED - Warnings treated as errors in strict mode")
-            return False
-        elif self.warnings:
-            print("⚠️  VALIDATION PASSED WITH WARNINGS")
-            return True
+        if total_warnings:
+            parts.append(f"\n⚠️  WARNINGS ({total_warnings}):")
+            parts.extend(f"   {warning}" for warning in self.warnings)
+        
+        if total_info:
+            parts.append(f"\nℹ️  INFO ({total_info}):")
+            parts.extend(f"   {info}" for info in self.info)
+        
+        parts.append("\n" + REPORT_SEPARATOR)
+        
+        success = self.is_successful()
+        if total_errors:
+            parts.append("❌ VALIDATION FAILED - Please fix the errors above")
+        elif not success:
+            parts.append("⚠️  VALIDATION FAILED - Warnings treated as errors in strict mode")
+        elif total_warnings:
+            parts.append("⚠️  VALIDATION PASSED WITH WARNINGS")
         else:
-            print("✅ VALIDATION PASSED")
-            return True
+            parts.append("✅ VALIDATION PASSED")
+        
+        sys.stdout.write("\n".join(parts) + "\n")
+        return success
 
-async def main():
-    """Main validation function."""
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser once and reuse it across main() calls."""
     parser = argparse.ArgumentParser(
         description="Validate Healthcare Study Companion configuration",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -250,6 +342,23 @@ async def main():
         help="Test actual connections (database, APIs)"
     )
     
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Emit the report as JSON instead of text"
+    )
+    
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Print the full report even when validation passes cleanly"
+    )
+    
+    return parser
+
+async def main():
+    """Main validation function."""
+    parser = build_parser()
     args = parser.parse_args()
     
     # Set environment if specified
@@ -262,28 +371,28 @@ async def main():
         strict=args.strict
     )
     
-    print("🔍 Starting configuration validation...")
-    
-    # Validate environment files
-    validator.validate_environment_files()
-    
-    # Validate settings
-    settings = validator.validate_settings()
-    
-    # Validate file permissions
-    validator.validate_file_permissions()
+    if not args.json:
+        print("🔍 Starting configuration validation...")
     
-    # Test connections if requested
-    if args.check_connections and settings:
-        print("🔗 Testing connections...")
-        await validator.test_database_connection(settings)
-        await validator.test_llm_api_connection(settings)
+    # Settings load first (the connection tests need them); the filesystem
+    # checks and connection tests then run concurrently
+    await validator.run_checks(check_connections=args.check_connections, show_progress=not args.json)
     
-    # Print report
-    success = validator.print_report()
+    # Print report; the JSON report is only built when asked for
+    if args.json:
+        sys.stdout.write(json.dumps(validator.generate_report(), indent=2) + "\n")
+        success = validator.is_successful()
+    else:
+        success = validator.print_report(verbose=args.verbose)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to the stock loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -13,12 +13,13 @@ Arguments:
     --strict: Fail on warnings (useful for CI/CD)
 """
 
+import io
 import os
 import sys
-import argparse
-from typing import List, Dict, Any, Optional, Tuple
+import functools
+from typing import List, Dict, Any, FrozenSet, Iterator, Optional, Tuple
 from pathlib import Path
-import json
+from collections import namedtuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -39,13 +40,239 @@ class ValidationLevel(Enum):
     INFO = "INFO"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
     level: ValidationLevel
     category: str
     message: str
     variable: Optional[str] = None
     suggestion: Optional[str] = None
+    # %-style arguments for message; formatting waits until the text is needed
+    args: Tuple[Any, ...] = ()
+
+    @property
+    def message_str(self) -> str:
+        """The message with its args substituted."""
+        return self.message % self.args if self.args else self.message
+
+
+# A validation rule: when ``predicate(settings, normalized)`` is true in an
+# environment covered by ``env_scope``, a result is reported with the remaining
+# fields. ``env_scope`` is None (every environment), a set of environment names,
+# or a callable taking the environment name.
+Rule = namedtuple("Rule", "env_scope predicate level category message variable suggestion")
+
+
+@dataclass(frozen=True)
+class _Normalized:
+    """Case-folded settings values shared by several rules, computed once per run."""
+    jwt_secret_lc: str
+    cors_lc: str
+    app_name_lc: str
+    db_url_lc: str
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "_Normalized":
+        return cls(
+            jwt_secret_lc=settings.jwt_secret.casefold(),
+            cors_lc=settings.cors_origins.casefold(),
+            app_name_lc=settings.app_name.casefold(),
+            db_url_lc=settings.database_url.casefold() if settings.database_url else "",
+        )
+
+
+_PRODUCTION = frozenset({"production"})
+_DEVELOPMENT = frozenset({"development"})
+_STAGING = frozenset({"staging"})
+
+
+def _non_production(env: str) -> bool:
+    """Scope for rules that apply in every environment except production."""
+    return env != "production"
+
+
+# Categories and repeated strings, shared by the rules below and the
+# ad-hoc results in EnvironmentValidator
+_CAT_CONFIG = "Configuration"
+_CAT_DB = "Database"
+_CAT_SECURITY = "Security"
+_CAT_LLM = "LLM"
+_CAT_EMAIL = "Email"
+_CAT_PERFORMANCE = "Performance"
+_CAT_DEPLOYMENT = "Deployment"
+_CAT_DEVELOPMENT = "Development"
+_CAT_STAGING = "Staging"
+_CAT_PRODUCTION = "Production"
+
+_MSG_WEAK_JWT = "JWT secret is using a default/weak value"
+_SUGG_STRONG_JWT = "Generate a strong, random JWT secret key"
+_MSG_SHORT_JWT = "JWT secret is too short (should be at least 32 characters)"
+_SUGG_LONGER_JWT = "Use a longer, more secure JWT secret"
+_SUGG_USE_PYMYSQL = "Use mysql+pymysql:// instead of mysql://"
+
+_WEAK_JWT_SECRETS: FrozenSet[str] = frozenset({"change-me", "dev-secret-key-change-me-in-production", "secret", "password"})
+
+# Rules checked before the provider API key (see _validate_llm_api_key)
+_RULES_BEFORE_API_KEY: Tuple[Rule, ...] = (
+    # Database
+    Rule(None, lambda s, n: not s.database_url,
+         ValidationLevel.ERROR, _CAT_DB,
+         "DATABASE_URL is not configured", "DATABASE_URL",
+         "Set DATABASE_URL or individual database connection parameters"),
+    Rule(None, lambda s, n: s.database_url and not s.database_url.startswith(("mysql+", "mysql://")),
+         ValidationLevel.WARNING, _CAT_DB,
+         "Database URL should use mysql+ driver for better compatibility", "DATABASE_URL",
+         _SUGG_USE_PYMYSQL),
+    Rule(_PRODUCTION, lambda s, n: s.database_url and "ssl" not in n.db_url_lc,
+         ValidationLevel.WARNING, _CAT_DB,
+         "SSL not configured for production database", "DATABASE_URL",
+         "Add SSL parameters to DATABASE_URL for production security"),
+    Rule(None, lambda s, n: s.database_url and s.db_pool_size < 1,
+         ValidationLevel.ERROR, _CAT_DB,
+         "Database pool size must be at least 1", "DB_POOL_SIZE", None),
+    Rule(None, lambda s, n: s.database_url and s.db_pool_size > 100,
+         ValidationLevel.WARNING, _CAT_DB,
+         "Database pool size is very high, may cause resource issues", "DB_POOL_SIZE",
+         "Consider reducing DB_POOL_SIZE to 20-50 for most applications"),
+
+    # Security
+    Rule(_PRODUCTION, lambda s, n: n.jwt_secret_lc in _WEAK_JWT_SECRETS,
+         ValidationLevel.ERROR, _CAT_SECURITY,
+         _MSG_WEAK_JWT, "JWT_SECRET",
+         _SUGG_STRONG_JWT),
+    Rule(_non_production, lambda s, n: n.jwt_secret_lc in _WEAK_JWT_SECRETS,
+         ValidationLevel.WARNING, _CAT_SECURITY,
+         _MSG_WEAK_JWT, "JWT_SECRET",
+         _SUGG_STRONG_JWT),
+    Rule(_PRODUCTION, lambda s, n: len(s.jwt_secret) < 32,
+         ValidationLevel.ERROR, _CAT_SECURITY,
+         _MSG_SHORT_JWT, "JWT_SECRET",
+         _SUGG_LONGER_JWT),
+    Rule(_non_production, lambda s, n: len(s.jwt_secret) < 32,
+         ValidationLevel.WARNING, _CAT_SECURITY,
+         _MSG_SHORT_JWT, "JWT_SECRET",
+         _SUGG_LONGER_JWT),
+    Rule(_PRODUCTION, lambda s, n: s.cors_origins == "*",
+         ValidationLevel.WARNING, _CAT_SECURITY,
+         "CORS allows all origins in production", "CORS_ORIGINS",
+         "Restrict CORS_ORIGINS to specific domains in production"),
+    Rule(_PRODUCTION, lambda s, n: "localhost" in n.cors_lc,
+         ValidationLevel.WARNING, _CAT_SECURITY,
+         "CORS includes localhost in production", "CORS_ORIGINS",
+         "Remove localhost from CORS_ORIGINS in production"),
+)
+
+# Rules checked after the provider API key, so results keep the
+# Database, Security, LLM, Email, ... section order
+_RULES_AFTER_API_KEY: Tuple[Rule, ...] = (
+    # LLM
+    Rule(None, lambda s, n: s.llm_rate_limit_per_minute < 1,
+         ValidationLevel.ERROR, _CAT_LLM,
+         "LLM rate limit must be at least 1 request per minute", "LLM_RATE_LIMIT_PER_MINUTE", None),
+    Rule(None, lambda s, n: s.llm_rate_limit_per_minute > 1000,
+         ValidationLevel.WARNING, _CAT_LLM,
+         "LLM rate limit is very high, may exceed API limits", "LLM_RATE_LIMIT_PER_MINUTE",
+         "Check your API provider's rate limits"),
+    Rule(None, lambda s, n: s.llm_temperature < 0 or s.llm_temperature > 2,
+         ValidationLevel.WARNING, _CAT_LLM,
+         "LLM temperature should be between 0 and 2", "LLM_TEMPERATURE",
+         "Use a temperature between 0.1 and 1.0 for most applications"),
+
+    # Email
+    Rule(None, lambda s, n: s.email_enabled and (not s.smtp_username or not s.smtp_password),
+         ValidationLevel.ERROR, _CAT_EMAIL,
+         "Email is enabled but SMTP credentials are missing", "SMTP_USERNAME, SMTP_PASSWORD",
+         "Set SMTP credentials or disable email functionality"),
+    Rule(None, lambda s, n: s.email_enabled and (not s.smtp_from_email or "@" not in s.smtp_from_email),
+         ValidationLevel.ERROR, _CAT_EMAIL,
+         "Invalid or missing SMTP from email address", "SMTP_FROM_EMAIL",
+         "Set a valid email address for SMTP_FROM_EMAIL"),
+    Rule(_PRODUCTION, lambda s, n: not s.email_enabled,
+         ValidationLevel.INFO, _CAT_EMAIL,
+         "Email functionality is disabled in production", None,
+         "Consider enabling email for password resets and notifications"),
+
+    # Performance
+    Rule(None, lambda s, n: s.max_concurrent_ai_requests < 1,
+         ValidationLevel.ERROR, _CAT_PERFORMANCE,
+         "Max concurrent AI requests must be at least 1", "MAX_CONCURRENT_AI_REQUESTS", None),
+    Rule(None, lambda s, n: s.max_concurrent_document_processing < 1,
+         ValidationLevel.ERROR, _CAT_PERFORMANCE,
+         "Max concurrent document processing must be at least 1", "MAX_CONCURRENT_DOCUMENT_PROCESSING", None),
+    Rule(_PRODUCTION, lambda s, n: s.max_concurrent_ai_requests > 50,
+         ValidationLevel.WARNING, _CAT_PERFORMANCE,
+         "Very high concurrent AI request limit may cause resource issues", "MAX_CONCURRENT_AI_REQUESTS",
+         "Consider a lower limit (10-20) unless you have high-capacity infrastructure"),
+    Rule(None, lambda s, n: s.max_file_size_mb < 1,
+         ValidationLevel.ERROR, _CAT_PERFORMANCE,
+         "Max file size must be at least 1 MB", "MAX_FILE_SIZE_MB", None),
+    Rule(None, lambda s, n: s.max_file_size_mb > 500,
+         ValidationLevel.WARNING, _CAT_PERFORMANCE,
+         "Very large file size limit may cause memory issues", "MAX_FILE_SIZE_MB",
+         "Consider a smaller limit (50-100 MB) for better performance"),
+
+    # Deployment
+    Rule(_PRODUCTION, lambda s, n: "dev" in n.app_name_lc,
+         ValidationLevel.WARNING, _CAT_DEPLOYMENT,
+         "App name contains 'dev' in production environment", "APP_NAME",
+         "Use a production-appropriate app name"),
+    Rule(_PRODUCTION, lambda s, n: s.log_level == "DEBUG",
+         ValidationLevel.WARNING, _CAT_DEPLOYMENT,
+         "Debug logging enabled in production", "LOG_LEVEL",
+         "Use INFO or WARNING log level in production"),
+    Rule(_PRODUCTION, lambda s, n: not s.structured_logging,
+         ValidationLevel.WARNING, _CAT_DEPLOYMENT,
+         "Structured logging disabled in production", "STRUCTURED_LOGGING",
+         "Enable structured logging for better monitoring in production"),
+
+    # Environment specific
+    Rule(_DEVELOPMENT, lambda s, n: s.db_pool_size > 10,
+         ValidationLevel.INFO, _CAT_DEVELOPMENT,
+         "Database pool size is high for development", "DB_POOL_SIZE",
+         "Consider using a smaller pool size (5-10) for development"),
+    Rule(_STAGING, lambda s, n: s.log_level == "DEBUG",
+         ValidationLevel.WARNING, _CAT_STAGING,
+         "Debug logging in staging environment", "LOG_LEVEL",
+         "Use INFO log level in staging to match production"),
+    Rule(_PRODUCTION, lambda s, n: not s.database_url,
+         ValidationLevel.ERROR, _CAT_PRODUCTION,
+         "DATABASE_URL is required for production", "DATABASE_URL",
+         "Set DATABASE_URL via secure environment variables"),
+    Rule(_PRODUCTION, lambda s, n: not s.jwt_secret,
+         ValidationLevel.ERROR, _CAT_PRODUCTION,
+         "JWT_SECRET is required for production", "JWT_SECRET",
+         "Set JWT_SECRET via secure environment variables"),
+)
+
+RULES: Tuple[Rule, ...] = _RULES_BEFORE_API_KEY + _RULES_AFTER_API_KEY
+
+ENVIRONMENTS = ("development", "staging", "production")
+
+
+def _in_scope(env_scope, env: str) -> bool:
+    """Whether a rule with env_scope applies in env."""
+    if env_scope is None:
+        return True
+    if callable(env_scope):
+        return env_scope(env)
+    return env in env_scope
+
+
+def _applicable(rules: Tuple[Rule, ...], env: str) -> Tuple[Rule, ...]:
+    """The rules that apply in env."""
+    return tuple(r for r in rules if _in_scope(r.env_scope, env))
+
+
+@functools.lru_cache(maxsize=16)
+def _rules_for(env: str) -> Tuple[Tuple[Rule, ...], Tuple[Rule, ...]]:
+    """Both rule groups pre-filtered for env, so a run walks only the rules that apply."""
+    return _applicable(_RULES_BEFORE_API_KEY, env), _applicable(_RULES_AFTER_API_KEY, env)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_settings() -> Settings:
+    """Parse the environment into Settings once per process."""
+    return Settings()
 
 
 class EnvironmentValidator:
@@ -55,39 +282,20 @@ class EnvironmentValidator:
         self.environment = environment
         self.strict = strict
         self.results: List[ValidationResult] = []
+    
+    @classmethod
+    def reset(cls) -> None:
+        """Forget the cached Settings so the next validate() re-reads the environment."""
+        _load_settings.cache_clear()
         
     def validate(self) -> Tuple[bool, List[ValidationResult]]:
         """Run all validation checks and return success status and results."""
-        self.results = []
-        
-        # Load settings and catch configuration errors
-        try:
-            settings = Settings()
-        except ConfigurationError as e:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.ERROR,
-                category="Configuration",
-                message=f"Configuration validation failed: {e}",
-                suggestion="Check your environment variables and fix the reported issues"
-            ))
-            return False, self.results
-        except Exception as e:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.ERROR,
-                category="Configuration",
-                message=f"Failed to load configuration: {e}",
-                suggestion="Check that all required environment variables are set"
-            ))
-            return False, self.results
-        
-        # Run validation checks
-        self._validate_database_config(settings)
-        self._validate_security_config(settings)
-        self._validate_llm_config(settings)
-        self._validate_email_config(settings)
-        self._validate_performance_config(settings)
-        self._validate_deployment_config(settings)
-        self._validate_environment_specific(settings)
+        # Keep the first occurrence of each distinct finding so overlapping
+        # rules do not report the same thing twice
+        seen: Dict[Tuple[Any, ...], ValidationResult] = {}
+        for r in self.stream():
+            seen.setdefault((r.level, r.category, r.variable, r.message, r.args), r)
+        self.results = list(seen.values())
         
         # Check if validation passed
         has_errors = any(r.level == ValidationLevel.ERROR for r in self.results)
@@ -96,299 +304,63 @@ class EnvironmentValidator:
         success = not has_errors and (not self.strict or not has_warnings)
         return success, self.results
     
-    def _validate_database_config(self, settings: Settings) -> None:
-        """Validate database configuration."""
-        if not settings.database_url:
-            self.results.append(ValidationResult(
+    def stream(self) -> Iterator[ValidationResult]:
+        """Yield validation results one at a time as the checks run."""
+        # Load settings and catch configuration errors
+        try:
+            settings = _load_settings()
+        except ConfigurationError as e:
+            yield ValidationResult(
                 level=ValidationLevel.ERROR,
-                category="Database",
-                message="DATABASE_URL is not configured",
-                variable="DATABASE_URL",
-                suggestion="Set DATABASE_URL or individual database connection parameters"
-            ))
+                category=_CAT_CONFIG,
+                message="Configuration validation failed: %s",
+                args=(e,),
+                suggestion="Check your environment variables and fix the reported issues"
+            )
             return
-        
-        # Check database URL format
-        if not settings.database_url.startswith(("mysql+", "mysql://")):
-            self.results.append(ValidationResult(
-                level=ValidationLevel.WARNING,
-                category="Database",
-                message="Database URL should use mysql+ driver for better compatibility",
-                variable="DATABASE_URL",
-                suggestion="Use mysql+pymysql:// instead of mysql://"
-            ))
-        
-        # Check SSL configuration for production
-        if self.environment == "production":
-            if "ssl" not in settings.database_url.lower():
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.WARNING,
-                    category="Database",
-                    message="SSL not configured for production database",
-                    variable="DATABASE_URL",
-                    suggestion="Add SSL parameters to DATABASE_URL for production security"
-                ))
-        
-        # Validate connection pool settings
-        if settings.db_pool_size < 1:
-            self.results.append(ValidationResult(
+        except Exception as e:
+            yield ValidationResult(
                 level=ValidationLevel.ERROR,
-                category="Database",
-                message="Database pool size must be at least 1",
-                variable="DB_POOL_SIZE"
-            ))
+                category=_CAT_CONFIG,
+                message="Failed to load configuration: %s",
+                args=(e,),
+                suggestion="Check that all required environment variables are set"
+            )
+            return
         
-        if settings.db_pool_size > 100:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.WARNING,
-                category="Database",
-                message="Database pool size is very high, may cause resource issues",
-                variable="DB_POOL_SIZE",
-                suggestion="Consider reducing DB_POOL_SIZE to 20-50 for most applications"
-            ))
+        # Run validation checks
+        normalized = _Normalized.from_settings(settings)
+        before_api_key, after_api_key = _rules_for(self.environment)
+        yield from self._run_rules(before_api_key, settings, normalized)
+        yield from self._validate_llm_api_key(settings)
+        yield from self._run_rules(after_api_key, settings, normalized)
     
-    def _validate_security_config(self, settings: Settings) -> None:
-        """Validate security configuration."""
-        # JWT Secret validation
-        weak_secrets = ["change-me", "dev-secret-key-change-me-in-production", "secret", "password"]
-        if settings.jwt_secret.lower() in weak_secrets:
-            level = ValidationLevel.ERROR if self.environment == "production" else ValidationLevel.WARNING
-            self.results.append(ValidationResult(
-                level=level,
-                category="Security",
-                message="JWT secret is using a default/weak value",
-                variable="JWT_SECRET",
-                suggestion="Generate a strong, random JWT secret key"
-            ))
-        
-        if len(settings.jwt_secret) < 32:
-            level = ValidationLevel.ERROR if self.environment == "production" else ValidationLevel.WARNING
-            self.results.append(ValidationResult(
-                level=level,
-                category="Security",
-                message="JWT secret is too short (should be at least 32 characters)",
-                variable="JWT_SECRET",
-                suggestion="Use a longer, more secure JWT secret"
-            ))
-        
-        # CORS validation
-        if self.environment == "production" and settings.cors_origins == "*":
-            self.results.append(ValidationResult(
-                level=ValidationLevel.WARNING,
-                category="Security",
-                message="CORS allows all origins in production",
-                variable="CORS_ORIGINS",
-                suggestion="Restrict CORS_ORIGINS to specific domains in production"
-            ))
-        
-        # Check for localhost in production CORS
-        if self.environment == "production" and "localhost" in settings.cors_origins:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.WARNING,
-                category="Security",
-                message="CORS includes localhost in production",
-                variable="CORS_ORIGINS",
-                suggestion="Remove localhost from CORS_ORIGINS in production"
-            ))
+    def _run_rules(self, rules: Tuple[Rule, ...], settings: Settings, normalized: _Normalized) -> Iterator[ValidationResult]:
+        """Evaluate pre-filtered rules against settings."""
+        for r in rules:
+            if r.predicate(settings, normalized):
+                yield ValidationResult(r.level, r.category, r.message, r.variable, r.suggestion)
     
-    def _validate_llm_config(self, settings: Settings) -> None:
-        """Validate LLM/AI configuration."""
-        # Check if API key is set for the selected provider
+    def _validate_llm_api_key(self, settings: Settings) -> Iterator[ValidationResult]:
+        """Validate the API key of the selected LLM provider."""
         api_key = settings.get_api_key_for_provider()
         if not api_key:
-            self.results.append(ValidationResult(
+            yield ValidationResult(
                 level=ValidationLevel.ERROR,
-                category="LLM",
-                message=f"API key not configured for LLM provider '{settings.llm_provider}'",
+                category=_CAT_LLM,
+                message="API key not configured for LLM provider '%s'",
                 variable=f"{settings.llm_provider.upper()}_API_KEY",
-                suggestion=f"Set the API key for {settings.llm_provider}"
-            ))
+                suggestion=f"Set the API key for {settings.llm_provider}",
+                args=(settings.llm_provider,)
+            )
         elif api_key.startswith("your_") or api_key.endswith("_here"):
-            self.results.append(ValidationResult(
+            yield ValidationResult(
                 level=ValidationLevel.ERROR,
-                category="LLM",
+                category=_CAT_LLM,
                 message="API key appears to be a placeholder value",
                 variable=f"{settings.llm_provider.upper()}_API_KEY",
                 suggestion="Replace with your actual API key"
-            ))
-        
-        # Validate rate limiting
-        if settings.llm_rate_limit_per_minute < 1:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.ERROR,
-                category="LLM",
-                message="LLM rate limit must be at least 1 request per minute",
-                variable="LLM_RATE_LIMIT_PER_MINUTE"
-            ))
-        
-        if settings.llm_rate_limit_per_minute > 1000:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.WARNING,
-                category="LLM",
-                message="LLM rate limit is very high, may exceed API limits",
-                variable="LLM_RATE_LIMIT_PER_MINUTE",
-                suggestion="Check your API provider's rate limits"
-            ))
-        
-        # Validate model parameters
-        if settings.llm_temperature < 0 or settings.llm_temperature > 2:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.WARNING,
-                category="LLM",
-                message="LLM temperature should be between 0 and 2",
-                variable="LLM_TEMPERATURE",
-                suggestion="Use a temperature between 0.1 and 1.0 for most applications"
-            ))
-    
-    def _validate_email_config(self, settings: Settings) -> None:
-        """Validate email configuration."""
-        if settings.email_enabled:
-            if not settings.smtp_username or not settings.smtp_password:
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.ERROR,
-                    category="Email",
-                    message="Email is enabled but SMTP credentials are missing",
-                    variable="SMTP_USERNAME, SMTP_PASSWORD",
-                    suggestion="Set SMTP credentials or disable email functionality"
-                ))
-            
-            if not settings.smtp_from_email or "@" not in settings.smtp_from_email:
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.ERROR,
-                    category="Email",
-                    message="Invalid or missing SMTP from email address",
-                    variable="SMTP_FROM_EMAIL",
-                    suggestion="Set a valid email address for SMTP_FROM_EMAIL"
-                ))
-        else:
-            if self.environment == "production":
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.INFO,
-                    category="Email",
-                    message="Email functionality is disabled in production",
-                    suggestion="Consider enabling email for password resets and notifications"
-                ))
-    
-    def _validate_performance_config(self, settings: Settings) -> None:
-        """Validate performance configuration."""
-        # Validate concurrent request limits
-        if settings.max_concurrent_ai_requests < 1:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.ERROR,
-                category="Performance",
-                message="Max concurrent AI requests must be at least 1",
-                variable="MAX_CONCURRENT_AI_REQUESTS"
-            ))
-        
-        if settings.max_concurrent_document_processing < 1:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.ERROR,
-                category="Performance",
-                message="Max concurrent document processing must be at least 1",
-                variable="MAX_CONCURRENT_DOCUMENT_PROCESSING"
-            ))
-        
-        # Check for reasonable limits based on environment
-        if self.environment == "production":
-            if settings.max_concurrent_ai_requests > 50:
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.WARNING,
-                    category="Performance",
-                    message="Very high concurrent AI request limit may cause resource issues",
-                    variable="MAX_CONCURRENT_AI_REQUESTS",
-                    suggestion="Consider a lower limit (10-20) unless you have high-capacity infrastructure"
-                ))
-        
-        # File upload validation
-        if settings.max_file_size_mb < 1:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.ERROR,
-                category="Performance",
-                message="Max file size must be at least 1 MB",
-                variable="MAX_FILE_SIZE_MB"
-            ))
-        
-        if settings.max_file_size_mb > 500:
-            self.results.append(ValidationResult(
-                level=ValidationLevel.WARNING,
-                category="Performance",
-                message="Very large file size limit may cause memory issues",
-                variable="MAX_FILE_SIZE_MB",
-                suggestion="Consider a smaller limit (50-100 MB) for better performance"
-            ))
-    
-    def _validate_deployment_config(self, settings: Settings) -> None:
-        """Validate deployment-specific configuration."""
-        if self.environment in ["staging", "production"]:
-            # Check for development-specific values in non-dev environments
-            if "dev" in settings.app_name.lower() and self.environment == "production":
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.WARNING,
-                    category="Deployment",
-                    message="App name contains 'dev' in production environment",
-                    variable="APP_NAME",
-                    suggestion="Use a production-appropriate app name"
-                ))
-            
-            # Check logging configuration
-            if settings.log_level == "DEBUG" and self.environment == "production":
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.WARNING,
-                    category="Deployment",
-                    message="Debug logging enabled in production",
-                    variable="LOG_LEVEL",
-                    suggestion="Use INFO or WARNING log level in production"
-                ))
-            
-            if not settings.structured_logging and self.environment == "production":
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.WARNING,
-                    category="Deployment",
-                    message="Structured logging disabled in production",
-                    variable="STRUCTURED_LOGGING",
-                    suggestion="Enable structured logging for better monitoring in production"
-                ))
-    
-    def _validate_environment_specific(self, settings: Settings) -> None:
-        """Validate environment-specific requirements."""
-        if self.environment == "development":
-            # Development-specific validations
-            if settings.db_pool_size > 10:
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.INFO,
-                    category="Development",
-                    message="Database pool size is high for development",
-                    variable="DB_POOL_SIZE",
-                    suggestion="Consider using a smaller pool size (5-10) for development"
-                ))
-        
-        elif self.environment == "staging":
-            # Staging should be similar to production
-            if settings.log_level == "DEBUG":
-                self.results.append(ValidationResult(
-                    level=ValidationLevel.WARNING,
-                    category="Staging",
-                    message="Debug logging in staging environment",
-                    variable="LOG_LEVEL",
-                    suggestion="Use INFO log level in staging to match production"
-                ))
-        
-        elif self.environment == "production":
-            # Production-specific validations
-            required_for_production = [
-                ("DATABASE_URL", settings.database_url),
-                ("JWT_SECRET", settings.jwt_secret),
-            ]
-            
-            for var_name, value in required_for_production:
-                if not value:
-                    self.results.append(ValidationResult(
-                        level=ValidationLevel.ERROR,
-                        category="Production",
-                        message=f"{var_name} is required for production",
-                        variable=var_name,
-                        suggestion=f"Set {var_name} via secure environment variables"
-                    ))
+            )
 
 
 def print_results(results: List[ValidationResult], verbose: bool = False) -> None:
@@ -397,56 +369,85 @@ def print_results(results: List[ValidationResult], verbose: bool = False) -> Non
         print("✅ All validation checks passed!")
         return
     
-    # Group results by level
-    errors = [r for r in results if r.level == ValidationLevel.ERROR]
-    warnings = [r for r in results if r.level == ValidationLevel.WARNING]
-    info = [r for r in results if r.level == ValidationLevel.INFO]
+    # Group results by level in one pass
+    buckets: Dict[ValidationLevel, List[ValidationResult]] = {level: [] for level in ValidationLevel}
+    for r in results:
+        buckets[r.level].append(r)
+    errors = buckets[ValidationLevel.ERROR]
+    warnings = buckets[ValidationLevel.WARNING]
+    info = buckets[ValidationLevel.INFO]
+    
+    # Format the whole report into one buffer and write it once
+    buf = io.StringIO()
+    write = buf.write
     
-    # Print summary
-    print(f"\n📊 Validation Summary:")
-    print(f"   Errors: {len(errors)}")
-    print(f"   Warnings: {len(warnings)}")
-    print(f"   Info: {len(info)}")
+    # Summary
+    write("\n📊 Validation Summary:\n")
+    write(f"   Errors: {len(errors)}\n")
+    write(f"   Warnings: {len(warnings)}\n")
+    write(f"   Info: {len(info)}\n")
     
-    # Print errors
+    # Errors
     if errors:
-        print(f"\n❌ Errors ({len(errors)}):")
-        for result in errors:
-            print(f"   [{result.category}] {result.message}")
-            if result.variable:
-                print(f"      Variable: {result.variable}")
-            if result.suggestion:
-                print(f"      Suggestion: {result.suggestion}")
-            print()
+        write(f"\n❌ Errors ({len(errors)}):\n")
+        for r in errors:
+            cat, msg, var, sug = r.category, r.message_str, r.variable, r.suggestion
+            write(f"   [{cat}] {msg}\n")
+            if var:
+                write(f"      Variable: {var}\n")
+            if sug:
+                write(f"      Suggestion: {sug}\n")
+            write("\n")
     
-    # Print warnings
+    # Warnings
     if warnings and verbose:
-        print(f"\n⚠️  Warnings ({len(warnings)}):")
-        for result in warnings:
-            print(f"   [{result.category}] {result.message}")
-            if result.variable:
-                print(f"      Variable: {result.variable}")
-            if result.suggestion:
-                print(f"      Suggestion: {result.suggestion}")
-            print()
+        write(f"\n⚠️  Warnings ({len(warnings)}):\n")
+        for r in warnings:
+            cat, msg, var, sug = r.category, r.message_str, r.variable, r.suggestion
+            write(f"   [{cat}] {msg}\n")
+            if var:
+                write(f"      Variable: {var}\n")
+            if sug:
+                write(f"      Suggestion: {sug}\n")
+            write("\n")
     
-    # Print info
+    # Info
     if info and verbose:
-        print(f"\nℹ️  Information ({len(info)}):")
-        for result in info:
-            print(f"   [{result.category}] {result.message}")
-            if result.suggestion:
-                print(f"      Suggestion: {result.suggestion}")
-            print()
+        write(f"\nℹ️  Information ({len(info)}):\n")
+        for r in info:
+            cat, msg, sug = r.category, r.message_str, r.suggestion
+            write(f"   [{cat}] {msg}\n")
+            if sug:
+                write(f"      Suggestion: {sug}\n")
+            write("\n")
+    
+    sys.stdout.write(buf.getvalue())
+
+
+def write_json(data: Dict[str, Any]) -> None:
+    """Write data to stdout as indented JSON."""
+    # Imported here so runs without --json skip the encoder imports entirely.
+    # orjson is optional; ensure_ascii=False keeps the fallback's output
+    # identical, since orjson never escapes non-ASCII characters.
+    try:
+        import orjson
+    except ImportError:
+        import json
+        json.dump(data, sys.stdout, indent=2, ensure_ascii=False)
+    else:
+        sys.stdout.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+    sys.stdout.write("\n")
 
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Validate environment configuration for Healthcare Study Companion"
     )
     parser.add_argument(
         "--environment", "-e",
-        choices=["development", "staging", "production"],
+        choices=ENVIRONMENTS,
         default=os.getenv("ENVIRONMENT", "development"),
         help="Target environment to validate"
     )
@@ -485,14 +486,14 @@ def main():
                 {
                     "level": r.level.value,
                     "category": r.category,
-                    "message": r.message,
+                    "message": r.message_str,
                     "variable": r.variable,
                     "suggestion": r.suggestion
                 }
                 for r in results
             ]
         }
-        print(json.dumps(output, indent=2))
+        write_json(output)
     else:
         # Human-readable output
         print_results(results, args.verbose)
@@ -6,43 +6,122 @@ This script validates that the Railway deployment is properly configured
 and all services are working correctly.
 """
 
+import asyncio
+import contextvars
 import os
 import sys
-import requests
+import httpx
 import time
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 
 # Add the backend directory to the Python path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-def get_railway_url() -> Optional[str]:
+# Every probe targets the same host, so one pooled keep-alive client serves
+# the whole run; later requests reuse the TCP/TLS connections already open.
+HTTP_LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=4)
+# Fail connection attempts fast and let the retries below absorb transient
+# loss, instead of one dropped packet stalling the run for the full 30s
+HTTP_TIMEOUT = httpx.Timeout(30, connect=5)
+
+# Retry transient failures (Railway cold starts answer 502/503/504 briefly)
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "OPTIONS"})
+
+# With the httpx[http2] extra installed, HTTPS probes multiplex over a single
+# HTTP/2 connection; servers that don't negotiate h2 fall back to HTTP/1.1.
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+def get_railway_url(env: Mapping[str, str] = os.environ) -> Optional[str]:
     """Get the Railway deployment URL."""
     # Railway sets RAILWAY_STATIC_URL or we can construct it
-    railway_url = os.getenv('RAILWAY_STATIC_URL')
+    railway_url = env.get('RAILWAY_STATIC_URL')
     
     if not railway_url:
         # Try to construct from Railway environment
-        railway_service = os.getenv('RAILWAY_SERVICE_NAME', 'web')
-        railway_project = os.getenv('RAILWAY_PROJECT_NAME')
+        railway_service = env.get('RAILWAY_SERVICE_NAME', 'web')
+        railway_project = env.get('RAILWAY_PROJECT_NAME')
         
         if railway_project:
             railway_url = f"https://{railway_project}-{railway_service}.railway.app"
     
     return railway_url
 
-def test_health_endpoint(base_url: str) -> Dict[str, Any]:
+class RetryTransport(httpx.AsyncHTTPTransport):
+    """Transport that retries idempotent probes on gateway errors with exponential backoff.
+
+    Connection failures are retried by the base transport (``retries=``).
+    """
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = await super().handle_async_request(request)
+            if (attempt >= RETRY_TOTAL
+                    or request.method not in RETRY_METHODS
+                    or response.status_code not in RETRY_STATUSES):
+                return response
+            await response.aclose()
+            await asyncio.sleep(RETRY_BACKOFF_FACTOR * (2 ** attempt))
+            attempt += 1
+
+# Endpoints timed by test_response_times
+TIMED_ENDPOINTS = ("/", "/healthz", "/docs")
+
+# In-flight or finished /healthz fetches for the current run, keyed by base URL
+_health_fetches: Dict[str, "asyncio.Future[Tuple[httpx.Response, Any]]"] = {}
+
+async def _get_health(client: httpx.AsyncClient, base_url: str) -> Tuple[httpx.Response, Any]:
+    """Fetch /healthz and parse its JSON body when the request succeeded."""
+    response = await client.get(f"{base_url}/healthz")
+    return response, response.json() if response.status_code == 200 else None
+
+async def fetch_health(client: httpx.AsyncClient, base_url: str) -> Tuple[httpx.Response, Any]:
+    """GET /healthz once per run; every probe that reads it shares the result."""
+    fetch = _health_fetches.get(base_url)
+    if fetch is None:
+        fetch = _health_fetches[base_url] = asyncio.ensure_future(_get_health(client, base_url))
+    return await fetch
+
+# The probes run concurrently, so each one collects its output here and the
+# report prints it under the probe's own header once they have all finished
+_probe_output: contextvars.ContextVar[List[str]] = contextvars.ContextVar("_probe_output")
+
+def _log(message: str) -> None:
+    """Record a line of probe output, or print it when called outside a report."""
+    lines = _probe_output.get(None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+async def _run_probe(test_func, client: httpx.AsyncClient, base_url: str) -> Tuple[Any, List[str]]:
+    """Run one probe in its own task context and return its result and output."""
+    lines: List[str] = []
+    _probe_output.set(lines)
+    try:
+        return await test_func(client, base_url), lines
+    except Exception as e:
+        return e, lines
+
+async def test_health_endpoint(client: httpx.AsyncClient, base_url: str) -> Dict[str, Any]:
     """Test the health endpoint."""
-    print("🔍 Testing health endpoint...")
+    _log("🔍 Testing health endpoint...")
     
     try:
-        response = requests.get(f"{base_url}/healthz", timeout=30)
+        response, health_data = await fetch_health(client, base_url)
         
         if response.status_code == 200:
-            health_data = response.json()
-            print(f"✅ Health endpoint responded: {health_data}")
+            _log(f"✅ Health endpoint responded: {health_data}")
             return {
                 "passed": True,
                 "status_code": response.status_code,
@@ -50,7 +129,7 @@ def test_health_endpoint(base_url: str) -> Dict[str, Any]:
                 "response_time": response.elapsed.total_seconds()
             }
         else:
-            print(f"❌ Health endpoint failed: {response.status_code}")
+            _log(f"❌ Health endpoint failed: {response.status_code}")
             return {
                 "passed": False,
                 "status_code": response.status_code,
@@ -59,22 +138,22 @@ def test_health_endpoint(base_url: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        print(f"❌ Health endpoint test failed: {e}")
+        _log(f"❌ Health endpoint test failed: {e}")
         return {
             "passed": False,
             "error": str(e)
         }
 
-def test_root_endpoint(base_url: str) -> Dict[str, Any]:
+async def test_root_endpoint(client: httpx.AsyncClient, base_url: str) -> Dict[str, Any]:
     """Test the root endpoint."""
-    print("🔍 Testing root endpoint...")
+    _log("🔍 Testing root endpoint...")
     
     try:
-        response = requests.get(base_url, timeout=30)
+        response = await client.get(base_url)
         
         if response.status_code == 200:
             root_data = response.json()
-            print(f"✅ Root endpoint responded: {root_data}")
+            _log(f"✅ Root endpoint responded: {root_data}")
             return {
                 "passed": True,
                 "status_code": response.status_code,
@@ -82,7 +161,7 @@ def test_root_endpoint(base_url: str) -> Dict[str, Any]:
                 "response_time": response.elapsed.total_seconds()
             }
         else:
-            print(f"❌ Root endpoint failed: {response.status_code}")
+            _log(f"❌ Root endpoint failed: {response.status_code}")
             return {
                 "passed": False,
                 "status_code": response.status_code,
@@ -91,28 +170,28 @@ def test_root_endpoint(base_url: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        print(f"❌ Root endpoint test failed: {e}")
+        _log(f"❌ Root endpoint test failed: {e}")
         return {
             "passed": False,
             "error": str(e)
         }
 
-def test_docs_endpoint(base_url: str) -> Dict[str, Any]:
+async def test_docs_endpoint(client: httpx.AsyncClient, base_url: str) -> Dict[str, Any]:
     """Test the API documentation endpoint."""
-    print("🔍 Testing API docs endpoint...")
+    _log("🔍 Testing API docs endpoint...")
     
     try:
-        response = requests.get(f"{base_url}/docs", timeout=30)
+        response = await client.get(f"{base_url}/docs")
         
         if response.status_code == 200:
-            print("✅ API docs endpoint accessible")
+            _log("✅ API docs endpoint accessible")
             return {
                 "passed": True,
                 "status_code": response.status_code,
                 "response_time": response.elapsed.total_seconds()
             }
         else:
-            print(f"❌ API docs endpoint failed: {response.status_code}")
+            _log(f"❌ API docs endpoint failed: {response.status_code}")
             return {
                 "passed": False,
                 "status_code": response.status_code,
@@ -121,15 +200,15 @@ def test_docs_endpoint(base_url: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        print(f"❌ API docs endpoint test failed: {e}")
+        _log(f"❌ API docs endpoint test failed: {e}")
         return {
             "passed": False,
             "error": str(e)
         }
 
-def test_cors_configuration(base_url: str) -> Dict[str, Any]:
+async def test_cors_configuration(client: httpx.AsyncClient, base_url: str) -> Dict[str, Any]:
     """Test CORS configuration."""
-    print("🔍 Testing CORS configuration...")
+    _log("🔍 Testing CORS configuration...")
     
     try:
         # Test preflight request
@@ -139,7 +218,7 @@ def test_cors_configuration(base_url: str) -> Dict[str, Any]:
             'Access-Control-Request-Headers': 'Content-Type'
         }
         
-        response = requests.options(f"{base_url}/healthz", headers=headers, timeout=30)
+        response = await client.options(f"{base_url}/healthz", headers=headers)
         
         cors_headers = {
             'Access-Control-Allow-Origin': response.headers.get('Access-Control-Allow-Origin'),
@@ -147,20 +226,20 @@ def test_cors_configuration(base_url: str) -> Dict[str, Any]:
             'Access-Control-Allow-Headers': response.headers.get('Access-Control-Allow-Headers')
         }
         
-        print(f"CORS Headers: {cors_headers}")
+        _log(f"CORS Headers: {cors_headers}")
         
         # Check if CORS is configured (at least one header present)
         has_cors = any(cors_headers.values())
         
         if has_cors:
-            print("✅ CORS configuration detected")
+            _log("✅ CORS configuration detected")
             return {
                 "passed": True,
                 "cors_headers": cors_headers,
                 "response_time": response.elapsed.total_seconds()
             }
         else:
-            print("⚠️  No CORS headers detected")
+            _log("⚠️  No CORS headers detected")
             return {
                 "passed": False,
                 "error": "No CORS headers found",
@@ -168,40 +247,39 @@ def test_cors_configuration(base_url: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        print(f"❌ CORS test failed: {e}")
+        _log(f"❌ CORS test failed: {e}")
         return {
             "passed": False,
             "error": str(e)
         }
 
-def test_database_connectivity_via_api(base_url: str) -> Dict[str, Any]:
+async def test_database_connectivity_via_api(client: httpx.AsyncClient, base_url: str) -> Dict[str, Any]:
     """Test database connectivity through the API."""
-    print("🔍 Testing database connectivity via API...")
+    _log("🔍 Testing database connectivity via API...")
     
     try:
         # The health endpoint includes database connectivity check
-        response = requests.get(f"{base_url}/healthz", timeout=30)
+        response, health_data = await fetch_health(client, base_url)
         
         if response.status_code == 200:
-            health_data = response.json()
             db_status = health_data.get('database', 'unknown')
             
             if db_status == 'connected':
-                print("✅ Database connectivity confirmed via API")
+                _log("✅ Database connectivity confirmed via API")
                 return {
                     "passed": True,
                     "database_status": db_status,
                     "response_time": response.elapsed.total_seconds()
                 }
             else:
-                print(f"❌ Database connectivity failed: {db_status}")
+                _log(f"❌ Database connectivity failed: {db_status}")
                 return {
                     "passed": False,
                     "database_status": db_status,
                     "response_time": response.elapsed.total_seconds()
                 }
         else:
-            print(f"❌ Health endpoint failed: {response.status_code}")
+            _log(f"❌ Health endpoint failed: {response.status_code}")
             return {
                 "passed": False,
                 "status_code": response.status_code,
@@ -209,39 +287,38 @@ def test_database_connectivity_via_api(base_url: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        print(f"❌ Database connectivity test failed: {e}")
+        _log(f"❌ Database connectivity test failed: {e}")
         return {
             "passed": False,
             "error": str(e)
         }
 
-def test_environment_configuration(base_url: str) -> Dict[str, Any]:
+async def test_environment_configuration(client: httpx.AsyncClient, base_url: str) -> Dict[str, Any]:
     """Test environment configuration through health endpoint."""
-    print("🔍 Testing environment configuration...")
+    _log("🔍 Testing environment configuration...")
     
     try:
-        response = requests.get(f"{base_url}/healthz", timeout=30)
+        response, health_data = await fetch_health(client, base_url)
         
         if response.status_code == 200:
-            health_data = response.json()
             environment = health_data.get('environment', 'unknown')
             
             if environment == 'production':
-                print("✅ Environment correctly set to production")
+                _log("✅ Environment correctly set to production")
                 return {
                     "passed": True,
                     "environment": environment,
                     "response_time": response.elapsed.total_seconds()
                 }
             else:
-                print(f"⚠️  Environment is '{environment}', expected 'production'")
+                _log(f"⚠️  Environment is '{environment}', expected 'production'")
                 return {
                     "passed": False,
                     "environment": environment,
                     "warning": "Environment not set to production"
                 }
         else:
-            print(f"❌ Health endpoint failed: {response.status_code}")
+            _log(f"❌ Health endpoint failed: {response.status_code}")
             return {
                 "passed": False,
                 "status_code": response.status_code,
@@ -249,32 +326,28 @@ def test_environment_configuration(base_url: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        print(f"❌ Environment configuration test failed: {e}")
+        _log(f"❌ Environment configuration test failed: {e}")
         return {
             "passed": False,
             "error": str(e)
         }
 
-def test_response_times(base_url: str) -> Dict[str, Any]:
+async def test_response_times(client: httpx.AsyncClient, base_url: str) -> Dict[str, Any]:
     """Test API response times."""
-    print("🔍 Testing API response times...")
+    _log("🔍 Testing API response times...")
     
-    endpoints = [
-        "/",
-        "/healthz",
-        "/docs"
-    ]
+    urls = [(endpoint, f"{base_url}{endpoint}") for endpoint in TIMED_ENDPOINTS]
     
     response_times = {}
     all_fast = True
     
     try:
-        for endpoint in endpoints:
-            start_time = time.time()
-            response = requests.get(f"{base_url}{endpoint}", timeout=30)
-            end_time = time.time()
+        for endpoint, url in urls:
+            response = await client.get(url)
             
-            response_time = (end_time - start_time) * 1000  # Convert to milliseconds
+            # Measured by the client itself, so time spent waiting on the other
+            # concurrent probes is not counted
+            response_time = response.elapsed.total_seconds() * 1000  # Convert to milliseconds
             response_times[endpoint] = {
                 "response_time_ms": response_time,
                 "status_code": response.status_code
@@ -282,9 +355,9 @@ def test_response_times(base_url: str) -> Dict[str, Any]:
             
             if response_time > 5000:  # More than 5 seconds
                 all_fast = False
-                print(f"⚠️  Slow response for {endpoint}: {response_time:.2f}ms")
+                _log(f"⚠️  Slow response for {endpoint}: {response_time:.2f}ms")
             else:
-                print(f"✅ {endpoint}: {response_time:.2f}ms")
+                _log(f"✅ {endpoint}: {response_time:.2f}ms")
         
         avg_response_time = sum(rt["response_time_ms"] for rt in response_times.values()) / len(response_times)
         
@@ -295,13 +368,13 @@ def test_response_times(base_url: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        print(f"❌ Response time test failed: {e}")
+        _log(f"❌ Response time test failed: {e}")
         return {
             "passed": False,
             "error": str(e)
         }
 
-def generate_deployment_report(base_url: str) -> Dict[str, Any]:
+async def generate_deployment_report(base_url: str, env: Mapping[str, str] = os.environ) -> Dict[str, Any]:
     """Generate a comprehensive deployment validation report."""
     print("🚀 Healthcare Study Companion - Railway Deployment Validation")
     print("=" * 70)
@@ -309,32 +382,43 @@ def generate_deployment_report(base_url: str) -> Dict[str, Any]:
     print("=" * 70)
     
     tests = [
-        ("Health Endpoint", lambda: test_health_endpoint(base_url)),
-        ("Root Endpoint", lambda: test_root_endpoint(base_url)),
-        ("API Documentation", lambda: test_docs_endpoint(base_url)),
-        ("CORS Configuration", lambda: test_cors_configuration(base_url)),
-        ("Database Connectivity", lambda: test_database_connectivity_via_api(base_url)),
-        ("Environment Configuration", lambda: test_environment_configuration(base_url)),
-        ("Response Times", lambda: test_response_times(base_url))
+        ("Health Endpoint", test_health_endpoint),
+        ("Root Endpoint", test_root_endpoint),
+        ("API Documentation", test_docs_endpoint),
+        ("CORS Configuration", test_cors_configuration),
+        ("Database Connectivity", test_database_connectivity_via_api),
+        ("Environment Configuration", test_environment_configuration),
+        ("Response Times", test_response_times)
     ]
     
+    # The tests are independent network probes, so run them concurrently
+    # over one shared client; total time is the slowest probe, not the sum.
+    _health_fetches.clear()
+    transport = RetryTransport(limits=HTTP_LIMITS, http2=HTTP2_ENABLED, retries=RETRY_TOTAL)
+    async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, transport=transport) as client:
+        outcomes = await asyncio.gather(
+            *(_run_probe(test_func, client, base_url) for _, test_func in tests)
+        )
+    _health_fetches.clear()
+    
     results = {}
     all_passed = True
     
-    for test_name, test_func in tests:
+    for (test_name, _), (result, lines) in zip(tests, outcomes):
         print(f"\n--- {test_name} ---")
-        try:
-            result = test_func()
-            results[test_name] = result
-            if not result.get("passed", False):
-                all_passed = False
-        except Exception as e:
+        for line in lines:
+            print(line)
+        if isinstance(result, Exception):
             results[test_name] = {
                 "passed": False,
-                "error": str(e)
+                "error": str(result)
             }
             all_passed = False
-            print(f"❌ {test_name} failed with exception: {e}")
+            print(f"❌ {test_name} failed with exception: {result}")
+            continue
+        results[test_name] = result
+        if not result.get("passed", False):
+            all_passed = False
     
     # Summary
     print("\n" + "=" * 70)
@@ -363,8 +447,8 @@ def generate_deployment_report(base_url: str) -> Dict[str, Any]:
     report = {
         "timestamp": time.time(),
         "base_url": base_url,
-        "environment": os.getenv("ENVIRONMENT", "unknown"),
-        "railway_deployment_id": os.getenv("RAILWAY_DEPLOYMENT_ID"),
+        "environment": env.get("ENVIRONMENT", "unknown"),
+        "railway_deployment_id": env.get("RAILWAY_DEPLOYMENT_ID"),
         "tests": results,
         "summary": {
             "total_tests": total_count,
@@ -383,8 +467,15 @@ def save_report(report: Dict[str, Any]):
         
         report_file = logs_dir / "railway_deployment_validation.json"
         
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        # Use orjson when installed. The report embeds whatever /healthz and /
+        # returned, so the fallback writes UTF-8 unescaped just as orjson does.
+        try:
+            import orjson
+        except ImportError:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        else:
+            report_file.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
         
         print(f"\n📄 Report saved to: {report_file}")
         
@@ -393,8 +484,11 @@ def save_report(report: Dict[str, Any]):
 
 def main():
     """Main function to run deployment validation."""
+    # Snapshot the environment once and hand it to everything that reads it
+    env = dict(os.environ)
+    
     # Get Railway URL
-    base_url = get_railway_url()
+    base_url = get_railway_url(env)
     
     if not base_url:
         # Try to get from command line argument
@@ -411,7 +505,7 @@ def main():
     
     try:
         # Run validation tests
-        report = generate_deployment_report(base_url)
+        report = asyncio.run(generate_deployment_report(base_url, env))
         
         # Save report
         save_report(report)
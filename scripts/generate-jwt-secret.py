@@ -9,11 +9,10 @@ Usage:
     
 Arguments:
     --length: Length of the secret key in bytes (default: 32)
-    --format: Output format (hex, base64, raw) (default: hex)
+    --format: Output format (hex, URL-safe base64, raw) (default: hex)
 """
 
 import secrets
-import base64
 import argparse
 import sys
 
@@ -21,16 +20,14 @@ import sys
 def generate_jwt_secret(length: int = 32, format_type: str = "hex") -> str:
     """Generate a cryptographically secure JWT secret."""
     
-    # Generate random bytes
-    secret_bytes = secrets.token_bytes(length)
-    
-    # Format the secret based on the requested format
+    # Draw and encode the random bytes in one stdlib call per format
     if format_type == "hex":
-        return secret_bytes.hex()
+        return secrets.token_hex(length)
     elif format_type == "base64":
-        return base64.b64encode(secret_bytes).decode('utf-8')
+        # URL-safe alphabet without padding, so the secret never contains "/" or "+"
+        return secrets.token_urlsafe(length)
     elif format_type == "raw":
-        return secret_bytes.decode('latin-1')
+        return secrets.token_bytes(length).decode('latin-1')
     else:
         raise ValueError(f"Unsupported format: {format_type}")
 
@@ -83,17 +80,17 @@ def main():
             print(f"Format: {args.format}")
             print()
         
-        # Generate secret(s)
-        for i in range(args.multiple):
-            secret = generate_jwt_secret(args.length, args.format)
-            
-            if args.quiet:
-                print(secret)
-            else:
-                if args.multiple > 1:
-                    print(f"Secret {i + 1}: {secret}")
-                else:
-                    print(f"JWT Secret: {secret}")
+        # Generate secret(s) and write them out in a single call
+        secrets_out = [generate_jwt_secret(args.length, args.format) for _ in range(args.multiple)]
+        
+        if args.quiet:
+            lines = secrets_out
+        elif args.multiple > 1:
+            lines = [f"Secret {i + 1}: {secret}" for i, secret in enumerate(secrets_out)]
+        else:
+            lines = [f"JWT Secret: {secret}" for secret in secrets_out]
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
         
         if not args.quiet:
             print()